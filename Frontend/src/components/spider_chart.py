@@ -1,19 +1,13 @@
 import pandas as pd
 import plotly.graph_objects as go
 
-def generate_spider_chart(parquet_path: str, profile: str) -> go.Figure:
-    df = pd.read_parquet(parquet_path)
-    df[df.select_dtypes(include=['float']).columns] = df.select_dtypes(include=['float']).round(1)
-    df = df[df["profile"] != "Balanced"]
-    df.drop(columns=["optimal_score", "unique_parameter"], inplace=True)
-
-    quality_cols = ['heating_quality', 'optimal_device', 'cooling_quality', 'cooking_quality', 'computing_quality']
-    df['quality'] = df[quality_cols].bfill(axis=1).iloc[:, 0]
-    df['quality'] = pd.to_numeric(df['quality'], errors='coerce')
-
-    df = df[df["profile"] == profile]
+def generate_spider_chart(profile_aggregates: pd.DataFrame, profile: str) -> go.Figure:
+    # Średnie cech są policzone wcześniej (prepare_profile_aggregates.py) – tu tylko wybór wierszy
+    means = profile_aggregates[
+        (profile_aggregates["profile"] == profile) & (profile_aggregates["kind"] == "feature_mean")
+    ]
 
-    if df.empty:
+    if means.empty:
         return go.Figure().update_layout(
             title=f"Brak danych dla profilu: {profile}",
             paper_bgcolor="#f0fdfa",
@@ -25,7 +19,7 @@ def generate_spider_chart(parquet_path: str, profile: str) -> go.Figure:
         "normalized_failure_rate", "device_cost", "quality"
     ]
 
-    profile_means = df.groupby("profile")[feature_cols].mean()
+    profile_means = means.pivot(index="profile", columns="name", values="value")[feature_cols]
 
     fig = go.Figure()
 
@@ -4,7 +4,6 @@ import json
 
 sys.path.append(os.path.abspath(os.path.join("../../")))
 
-import pickle
 import dash
 from dash import html, dcc, Input, Output, State, callback, ctx
 import dash_bootstrap_components as dbc
@@ -13,16 +12,15 @@ from dash.exceptions import PreventUpdate
 
 
 from src.recommendation_engine.predict_profile_for_user import predict_profile_for_user
-from src.ai_answer_engine.gemini_model_answer import (
-    load_api_key,
-    configure_gemini_client,
-    interpret_prediction_with_gemini
-)
+from src.recommendation_engine.artifact_registry import get_artifact
+from src.ai_answer_engine.gemini_model_answer import load_api_key
+from src.ai_answer_engine.explanation_service import build_explanation_service
 
 try:
-    configure_gemini_client(load_api_key())
+    explanation_service = build_explanation_service(load_api_key())
 except:
     print("Załadowanie API KEY do Gemini nie powiodło się")
+    explanation_service = build_explanation_service(None)
 
 
 dash.register_page(__name__, path_template="/profil", name="Profil")
@@ -160,11 +158,8 @@ def run_interpretation(user_input):
         raise PreventUpdate
 
     try:
-        with open("../../models/feature_order_user_profile_model.pkl", "rb") as f:
-            feature_order = pickle.load(f)
-
-        with open("../../models/user_profile_model.pkl", "rb") as f:
-            model = pickle.load(f)
+        feature_order = get_artifact("feature_order")
+        model = get_artifact("user_profile_model_compiled")
 
         profiles = predict_profile_for_user(
             user_input=user_input,
@@ -177,7 +172,7 @@ def run_interpretation(user_input):
             f"**Alternatywny profil:** `{profiles[1]}`  \n\n"
         )
 
-        interpretation = recommendation + interpret_prediction_with_gemini(
+        interpretation = recommendation + explanation_service.explain(
             user_input,
             predicted_profiles=profiles
         )
@@ -1,6 +1,5 @@
 import sys
 import os
-import pickle
 import html
 import dash
 from dash import html, dcc, callback, Input, Output
@@ -10,26 +9,29 @@ sys.path.append(os.path.abspath(os.path.join("../../")))
 
 from components.spider_chart import generate_spider_chart
 from components.plot_all_metrics_for_category_plotly import plot_all_metrics_for_category_plotly
+from src.recommendation_engine.artifact_registry import get_artifact
+from src.recommendation_engine.recommend_best_device_per_group import recommend_best_per_category_for_input
+from src.comparisons.decision_regions import build_decision_indices
+from src.pipelines.generate_grid import category_datasets
 
 dash.register_page(__name__, path_template="/zestawienie", name="Zestawienie")
 
-# === Wczytaj dane tylko raz ===
-with open("../../src/recommendation_engine/pickles/combined_df.pkl", "rb") as f:
-    combined_df = pickle.load(f)
-
-with open("../../src/recommendation_engine/pickles/appliance_recommendations_for_profiles.pkl", "rb") as f:
-    appliance_recommendations_for_profiles = pickle.load(f)
+# Regiony decyzyjne liczone raz przy starcie – dokładna odpowiedź dla dowolnych ustawień suwaków, bez siatki wag
+DECISION_INDICES = build_decision_indices(category_datasets())
 
 # === Layout strony ===
 def layout(**kwargs):
     return html.Div([
         dmc.Container([
             dcc.Store(id="user-profile-selection", storage_type="session"),
+            dcc.Store(id="user-input-store", storage_type="session"),
 
             dmc.Title("Zestawienie Urządzeń", order=1, ta="center"),
 
             html.Div(id="spider-chart-container", style={"marginTop": "40px"}),
 
+            html.Div(id="exact-recommendations", style={"marginTop": "40px"}),
+
             html.Div(id="zestawienie-wykresy", style={"marginTop": "50px"})
         ])
     ])
@@ -43,7 +45,7 @@ def update_spider_chart(selected_profile):
     if selected_profile is None:
         return dmc.Text("⚠️ Brak wybranego profilu – wykres radarowy niedostępny.", c="red")
 
-    fig = generate_spider_chart("../../Data/GRID/grid_with_profiles.parquet", profile=selected_profile)
+    fig = generate_spider_chart(get_artifact("profile_aggregates"), profile=selected_profile)
     fig.update_layout(
         paper_bgcolor="#f0fdfa",
         plot_bgcolor="#f0fdfa",
@@ -60,6 +62,27 @@ def update_spider_chart(selected_profile):
         }
     )
 
+@callback(
+    Output("exact-recommendations", "children"),
+    Input("user-input-store", "data")
+)
+def update_exact_recommendations(user_input):
+    if not user_input:
+        return dmc.Text("⚠️ Brak ustawień z formularza – rekomendacje dla Twoich wag niedostępne.", c="red")
+
+    best_per_category = recommend_best_per_category_for_input(user_input, DECISION_INDICES)
+    return html.Div([
+        dmc.Title("Najlepsze urządzenia dla Twoich ustawień", order=3, ta="center"),
+        dmc.Table(data={
+            "head": ["Kategoria", "Urządzenie", "Przewaga nad drugim"],
+            "body": [
+                [category, device, f"{margin:.3f}"]
+                for category, (device, score, margin) in best_per_category.items()
+            ],
+        }, striped=True, highlightOnHover=True)
+    ], style={"maxWidth": "800px", "margin": "0 auto"})
+
+
 @callback(
     Output("zestawienie-wykresy", "children"),
     Input("user-profile-selection", "data")
@@ -71,9 +94,9 @@ def update_zestawienie_wykresy(selected_profile):
         return dmc.Text("⚠️ Nie wybrano profilu użytkownika.", c="red")
 
     figures = plot_all_metrics_for_category_plotly(
-        combined_df,
+        get_artifact("combined_df"),
         profile=selected_profile,
-        appliance_recommendations_for_profiles=appliance_recommendations_for_profiles,
+        appliance_recommendations_for_profiles=get_artifact("appliance_recommendations_for_profiles"),
         show=False
     )
 
@@ -0,0 +1,173 @@
+import sys
+import os
+import json
+import asyncio
+import threading
+import urllib.request
+
+sys.path.append(os.path.abspath(os.path.join("../../")))
+
+from src.comparisons.cache import ResultCache
+from src.ai_answer_engine.prompts import build_prompt, get_profile_description
+
+DEFAULT_API_ENDPOINT = "https://generativelanguage.googleapis.com"
+DEFAULT_MODEL_NAME = "gemini-2.0-flash"
+
+
+class GeminiRestClient:
+    """
+    Minimal async client for the Gemini `generateContent` REST endpoint.
+
+    The endpoint is configurable, so a local stub server can stand in for the Gemini API
+    (e.g. in tests or offline demos). The HTTP call runs in a worker thread, so awaiting
+    it never blocks the event loop.
+    """
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MODEL_NAME, api_endpoint: str = DEFAULT_API_ENDPOINT):
+        """
+        Args:
+            api_key (str): Gemini API key.
+            model_name (str): Gemini model name.
+            api_endpoint (str): Base URL of the API, e.g. "http://127.0.0.1:8765" for a stub server.
+        """
+        self.api_key = api_key
+        self.model_name = model_name
+        self.api_endpoint = api_endpoint.rstrip("/")
+
+    def _post(self, prompt: str, timeout: float) -> str:
+        request = urllib.request.Request(
+            f"{self.api_endpoint}/v1beta/models/{self.model_name}:generateContent",
+            data=json.dumps({"contents": [{"parts": [{"text": prompt}]}]}).encode("utf-8"),
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.load(response)
+        return payload["candidates"][0]["content"]["parts"][0]["text"].strip()
+
+    async def generate(self, prompt: str, timeout: float) -> str:
+        """
+        Returns:
+            str: Text of the first candidate of the model's answer.
+        """
+        return await asyncio.to_thread(self._post, prompt, timeout)
+
+
+def fallback_explanation(predicted_profiles) -> str:
+    """
+    Deterministic explanation used when the LLM does not answer in time or fails.
+    """
+    return (
+        f"Najbardziej prawdopodobny profil **{predicted_profiles[0]}**: "
+        f"{get_profile_description(predicted_profiles[0])}\n\n"
+        f"Alternatywny profil **{predicted_profiles[1]}**: "
+        f"{get_profile_description(predicted_profiles[1])}\n\n"
+        "Rekomendujemy profil najbardziej prawdopodobny, ale czasem alternatywa jest zasadna. "
+        "(Szczegółowe wyjaśnienie AI jest chwilowo niedostępne.)"
+    )
+
+
+class ExplanationService:
+    """
+    Cached, coalescing front of the LLM explanation of a predicted profile.
+
+    - Answers are cached by (model, prompt) in a `ResultCache` (in-memory LRU, optionally
+      persisted on disk), so identical slider settings are answered without calling the LLM.
+    - Concurrent requests for the same prompt share one in-flight LLM call.
+    - Every call is bounded by `timeout`; on timeout or error the deterministic
+      `fallback_explanation` is returned (and not cached, so the next request retries).
+
+    Dash callbacks call the blocking `explain`, which runs the coroutine on one background
+    event loop shared by all worker threads, so coalescing also works across threads.
+    """
+
+    def __init__(self, client, cache: ResultCache = None, timeout: float = 15.0):
+        """
+        Args:
+            client: Object with `async generate(prompt, timeout) -> str` (e.g. GeminiRestClient);
+                None always returns the fallback.
+            cache (ResultCache, optional): Response cache. Defaults to an in-memory LRU of 512 entries.
+            timeout (float): Seconds to wait for the LLM before falling back.
+        """
+        self.client = client
+        self.cache = cache if cache is not None else ResultCache(maxsize=512)
+        self.timeout = timeout
+        self._in_flight = {}
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def _cache_key(self, prompt: str) -> tuple:
+        return (getattr(self.client, "model_name", None), prompt)
+
+    async def explain_async(self, user_input: dict, predicted_profiles) -> str:
+        """
+        Returns:
+            str: Explanation of the top-2 predicted profiles for the given user input.
+        """
+        prompt = build_prompt(
+            user_input,
+            predicted_profiles,
+            get_profile_description(predicted_profiles[0]),
+            get_profile_description(predicted_profiles[1]),
+        )
+        key = self._cache_key(prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(key, prompt))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        answer = await asyncio.shield(task)
+        return answer if answer is not None else fallback_explanation(predicted_profiles)
+
+    async def _generate(self, key: tuple, prompt: str):
+        if self.client is None:
+            return None
+        try:
+            answer = await asyncio.wait_for(self.client.generate(prompt, self.timeout), self.timeout)
+        except Exception as e:
+            print(f"Brak odpowiedzi z Gemini ({type(e).__name__}: {e}). Używam szablonu.")
+            return None
+        self.cache.set(key, answer)
+        return answer
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="explanation-service", daemon=True).start()
+            return self._loop
+
+    def explain(self, user_input: dict, predicted_profiles) -> str:
+        """
+        Blocking wrapper around `explain_async` for synchronous callers such as Dash callbacks.
+        """
+        future = asyncio.run_coroutine_threadsafe(self.explain_async(user_input, predicted_profiles), self._event_loop())
+        return future.result()
+
+
+def build_explanation_service(api_key: str = None) -> ExplanationService:
+    """
+    Builds the service from environment variables:
+    GEMINI_API_ENDPOINT, GEMINI_MODEL_NAME, GEMINI_TIMEOUT and
+    EXPLANATION_CACHE_SIZE, EXPLANATION_CACHE_TTL, EXPLANATION_CACHE_DIR.
+
+    Args:
+        api_key (str, optional): Gemini API key. Without it every answer is the fallback template.
+    """
+    client = None
+    if api_key:
+        client = GeminiRestClient(
+            api_key,
+            model_name=os.getenv("GEMINI_MODEL_NAME", DEFAULT_MODEL_NAME),
+            api_endpoint=os.getenv("GEMINI_API_ENDPOINT", DEFAULT_API_ENDPOINT),
+        )
+    cache = ResultCache(
+        maxsize=int(os.getenv("EXPLANATION_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("EXPLANATION_CACHE_TTL")) if os.getenv("EXPLANATION_CACHE_TTL") else None,
+        cache_dir=os.getenv("EXPLANATION_CACHE_DIR"),
+    )
+    return ExplanationService(client, cache=cache, timeout=float(os.getenv("GEMINI_TIMEOUT", "15")))
@@ -0,0 +1,62 @@
+"""
+Profile descriptions and the LLM prompt, kept free of the Gemini SDK so they can be
+imported without `google.generativeai` or `dotenv` installed.
+"""
+
+
+def get_profile_description(profile_name: str) -> str:
+    """
+    Returns a description for a given user profile.
+
+    Args:
+        profile_name (str): The predicted profile class name.
+
+    Returns:
+        str: Description of the profile.
+    """
+    descriptions = {
+        "EcoFriendly": "Priorytetem jest minimalna emisja CO₂. Użytkownik toleruje umiarkowane koszty, awaryjność i komfort, jeśli oznacza to bardziej ekologiczne rozwiązanie.",
+        "Saver": "Najważniejsze są niskie koszty użytkowania. Komfort, emisja CO₂ i inne cechy mają drugorzędne znaczenie – liczy się oszczędność.",
+        "ComfortSeeker": "Najbardziej liczy się komfort użytkowania. Osoba z tym profilem stawia wygodę ponad kosztami czy efektywnością energetyczną.",
+        "Budget": "Najważniejszy jest niski koszt zakupu urządzenia. Pozostałe aspekty są mniej istotne – użytkownik szuka budżetowych opcji.",
+        "RiskAware": "Najważniejsza jest niska awaryjność. Osoba z tym profilem unika ryzyka związanego z zawodnością sprzętu, nawet kosztem innych parametrów.",
+        "QualitySeeker": "Skupia się na jakości, niezawodności oraz wysokim komforcie. Jest gotów ponieść wyższe koszty, byle produkt spełniał wysokie standardy.",
+        "Bourgeois": "Stawia na wysoką jakość, komfort oraz prestiż. Może akceptować wyższe koszty i emisje CO₂, jeśli urządzenie wpisuje się w styl życia klasy wyższej."
+    }
+    return descriptions.get(profile_name, "Brak opisu tego profilu.")
+
+
+def build_prompt(user_input: dict, predicted_profiles: tuple[str, str], profile_1_desc: str, profile_2_desc: str) -> str:
+    """
+    Constructs a prompt to be sent to the Gemini model.
+
+    Args:
+        user_input (dict): Dictionary of input features.
+        predicted_profiles (tuple): Tuple with 1st and 2nd most probable profile names.
+        profile_1_desc (str): Description of the most probable profile.
+        profile_2_desc (str): Description of the second most probable profile.
+
+    Returns:
+        str: Complete prompt to send to the LLM.
+    """
+    return f"""
+Użytkownik podał następujące wartości wejściowe:
+- Koszt użytkowania (PLN): {user_input["cost_pln"]}
+- Emisja CO2 (kg): {user_input["co2_emission_kg"]}
+- Komfort: {user_input["normalized_comfort"]}
+- Awaryjność: {user_input["normalized_failure_rate"]}
+- Koszt urządzenia (ocena względna): {user_input["device_cost"]}
+- Jakość gotowania: {user_input["cooking_quality"]}
+
+Model ML przypisał użytkownikowi profil: **{predicted_profiles[0]}**
+Opis profilu: {profile_1_desc}
+
+Wyjaśnij, dlaczego użytkownik został zaklasyfikowany jako najbardziej prawdopodobnie {predicted_profiles[0]}, odnosząc się do podanych wartości.
+
+Następnie skomentuj drugi możliwy wynik jako alternatywny: **{predicted_profiles[1]}**
+Opis profilu: {profile_2_desc}
+
+Opowiedz w podsumowaniu że rekomendujesz najbardziej prawdopodobny wynik, ale czasem alternatywa jest zasadna .
+
+Odpowiedz po polsku, zwięźle i jasno.
+"""
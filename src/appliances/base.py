@@ -1,5 +1,40 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+import pandas as pd
+
+
+class _BatchArray(np.ndarray):
+    """
+    NumPy array that also supports the built-in round(), so the scalar metric methods of
+    the appliances run unchanged on whole parameter columns (see Appliance.evaluate_batch).
+    """
+
+    def __round__(self, ndigits=None):
+        # 0-d arrays (scalar parameters) are rounded as 1-element arrays and reshaped back
+        values = np.atleast_1d(self.view(np.ndarray)).astype(float)
+        rounded = np.round(values, ndigits or 0)
+        # np.round is not correctly rounded in decimal (0.2375 -> 0.238, the built-in gives 0.237),
+        # so values close to a half-way point are rounded with the built-in to match the scalar methods.
+        scaled = values * 10.0 ** (ndigits or 0)
+        halfway = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+        rounded[halfway] = [round(value, ndigits) for value in values[halfway].tolist()]
+        return rounded.reshape(self.shape).view(_BatchArray)
+
+
+def as_batch_array(values):
+    """
+    Wrap scalar or array parameter values so appliance metric methods can evaluate them column-wise.
+
+    Args:
+        values (float or array-like): Parameter values.
+
+    Returns:
+        np.ndarray: The values as an array that also supports the built-in round().
+    """
+    return np.asarray(values).view(_BatchArray)
+
+
 class Appliance(ABC):
     """
     Abstract base class for all household appliances.
@@ -10,6 +45,9 @@ class Appliance(ABC):
     Subclasses must implement device-specific logic.
     """
 
+    # Energy source billed in cost(); gas appliances override it with "gas".
+    energy_carrier = "electricity"
+
     def __init__(self, name, comfort_penalty=0.0, failure_rate=0.0):
         """
         Initialize the appliance.
@@ -102,3 +140,29 @@ class Appliance(ABC):
             "device_cost": self.device_cost(),
             "failure_rate": self.failure_rate()
         }
+
+    @classmethod
+    def evaluate_batch(cls, **params):
+        """
+        Evaluate the appliance for many parameter values in a single vectorized pass.
+
+        Every keyword argument is a constructor parameter given as a scalar or an array,
+        e.g. `Kettle.evaluate_batch(liters=np.array([0.5, 1.0, 1.5]))` or
+        `HeatPump.evaluate_batch(liters=50, cop=np.linspace(2, 5, 31))`. The arrays are
+        broadcast against each other and passed to one appliance instance, so the metric
+        methods compute whole columns at once instead of one object per parameter value.
+
+        Args:
+            **params: Constructor parameters as scalars or NumPy arrays.
+
+        Returns:
+            pd.DataFrame: One row per (broadcast) parameter combination, with the parameter
+            columns followed by the columns of `summary()`.
+        """
+        arrays = np.broadcast_arrays(*(np.asarray(value) for value in params.values()))
+        size = arrays[0].size if arrays else 1
+        columns = {name: array.ravel() for name, array in zip(params, arrays)}
+        summary = cls(**{name: as_batch_array(column) for name, column in columns.items()}).summary()
+        for key, value in summary.items():
+            columns[key] = np.broadcast_to(np.asarray(value).view(np.ndarray), (size,))
+        return pd.DataFrame(columns)
@@ -42,6 +42,8 @@ class InductionHob(Appliance):
     
 
 class GasHob(Appliance):
+    energy_carrier = "gas"
+
     def __init__(self, liters=1.0, comfort_penalty=0.0, failure_rate=0.0):
         super().__init__("GasHob", comfort_penalty=comfort_penalty, failure_rate=failure_rate)
         self.liters = liters
@@ -20,11 +20,10 @@ class ElectricHeater(Appliance):
     def device_cost(self): 
         return 1200  
 
-    def heating_quality(self): 
-        return 0.4
+    def heating_quality(self, emission_factor=0.4): 
+        return emission_factor
     
-    def cost_per_kwh_heat(self):
-        electricity_price = 0.65  # 
+    def cost_per_kwh_heat(self, electricity_price=0.65):
         return electricity_price / 1.0
 
     def summary(self):
@@ -35,6 +34,8 @@ class ElectricHeater(Appliance):
     
 
 class GasHeater(Appliance): 
+    energy_carrier = "gas"
+
     def __init__(self, liters=50, comfort_penalty=0.08, failure_rate=0.07): 
         super().__init__("GasHeater", comfort_penalty, failure_rate) 
         self.liters = liters 
@@ -91,11 +92,10 @@ class FlowHeater(Appliance):
     def device_cost(self): 
         return 1000
 
-    def heating_quality(self): 
-        return 0.4  # jak dla prądu w PL
+    def heating_quality(self, emission_factor=0.4): 
+        return emission_factor  # 0.4 jak dla prądu w PL
 
-    def cost_per_kwh_heat(self):
-        electricity_price = 0.65
+    def cost_per_kwh_heat(self, electricity_price=0.65):
         return electricity_price / 1.0
 
     def summary(self):
@@ -127,11 +127,10 @@ class HeatPump(Appliance):
     def device_cost(self): 
         return 4500
 
-    def heating_quality(self): 
-        return round(0.4 / self.cop, 3)  # redukcja śladu CO₂ dzięki COP
+    def heating_quality(self, emission_factor=0.4): 
+        return round(emission_factor / self.cop, 3)  # redukcja śladu CO₂ dzięki COP
 
-    def cost_per_kwh_heat(self):
-        electricity_price = 0.65
+    def cost_per_kwh_heat(self, electricity_price=0.65):
         return electricity_price / self.cop
 
     def summary(self):
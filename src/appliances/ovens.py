@@ -79,6 +79,8 @@ class AirFryer(Appliance):
 
 
 class GasOven(Appliance):
+    energy_carrier = "gas"
+
     def __init__(self, time_minutes=30, comfort_penalty=0.2, failure_rate=0.1, heating_quality=0.88):
         super().__init__("GasOven", comfort_penalty, failure_rate)
         self.time_minutes = time_minutes
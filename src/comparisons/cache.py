@@ -0,0 +1,211 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live and an optional on-disk store.
+
+    Entries live in memory up to `maxsize` items, least recently used first out. When
+    `cache_dir` is set, every entry is also pickled to disk, so other processes (the
+    frontend workers, the pipeline scripts) can reuse results computed elsewhere.
+    """
+
+    def __init__(self, maxsize=256, ttl=None, cache_dir=None):
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept in memory.
+            ttl (float, optional): Seconds after which an entry expires. None means never.
+            cache_dir (str or Path, optional): Folder of the on-disk store. None keeps the cache in memory only.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.pkl"
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _load_from_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, created, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if stored_key != key or self._expired(created):
+            return None
+        # unpickled arrays are writeable again
+        if isinstance(value, pd.DataFrame):
+            value = freeze_frame(value)
+        return created, value
+
+    def get(self, key, default=None):
+        """
+        Returns:
+            The cached value for `key`, or `default` if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                entry = self._load_from_disk(key)
+                if entry is not None:
+                    self._store(key, entry)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set(self, key, value):
+        """
+        Store `value` under `key` in memory and, if configured, on disk.
+        """
+        entry = (time.time(), value)
+        with self._lock:
+            self._store(key, entry)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, entry[0], value), f)
+            os.replace(tmp_path, path)
+
+    def clear(self):
+        """
+        Drop all in-memory entries (the on-disk store is left untouched).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of `df` whose column arrays are read-only, so a cached result cannot be modified in place.
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+# Files whose code determines the comparison tables: device models, kernel and factories
+FINGERPRINT_SOURCES = [
+    *sorted((Path(__file__).resolve().parents[1] / "appliances").glob("*.py")),
+    Path(__file__).resolve().parent / "kernel.py",
+    Path(__file__).resolve().parent / "household.py",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """
+    Hash of the source of the device models and factories, part of every cache key,
+    so persisted tables are not served after `src/appliances/*` changes.
+    """
+    digest = hashlib.sha256()
+    for path in FINGERPRINT_SOURCES:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _key_value(value):
+    """
+    Hashable stand-in for an argument: arrays are keyed by dtype, shape and a hash of their contents.
+    """
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.dtype.str, value.shape, hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_value(v) for v in value)
+    return value
+
+
+COMPARISON_CACHE = ResultCache(
+    maxsize=int(os.getenv("COMPARISON_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("COMPARISON_CACHE_TTL")) if os.getenv("COMPARISON_CACHE_TTL") else None,
+    cache_dir=os.getenv("COMPARISON_CACHE_DIR"),
+)
+
+
+def memoize_comparison(func=None, cache=None):
+    """
+    Memoize a `compare_*` entry point on its category and all of its (scenario, tariff and
+    emission-factor) arguments.
+
+    Repeated calls with the same arguments return the cached table without recomputing it.
+    The cached table itself is read-only; every call gets its own writeable copy, so callers
+    may modify the result (`df.loc[...] = ...`, `df["c"] *= 2`) as with an uncached call
+    without changing what later calls receive.
+    Keys include `code_fingerprint()`; NumPy array arguments are keyed by their contents,
+    and calls with other unhashable arguments bypass the cache.
+
+    Args:
+        func (callable): The comparison function.
+        cache (ResultCache, optional): Cache to use. Defaults to COMPARISON_CACHE, configured
+            with the COMPARISON_CACHE_SIZE, COMPARISON_CACHE_TTL and COMPARISON_CACHE_DIR
+            environment variables.
+    """
+    if func is None:
+        return functools.partial(memoize_comparison, cache=cache)
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        target = COMPARISON_CACHE if cache is None else cache
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (
+            code_fingerprint(),
+            func.__qualname__,
+            tuple((name, _key_value(value)) for name, value in bound.arguments.items()),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        result = target.get(key)
+        if result is None:
+            result = freeze_frame(func(*args, **kwargs))
+            target.set(key, result)
+        return result.copy(deep=True)
+
+    return wrapper
@@ -0,0 +1,145 @@
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join("../")))
+from src.comparisons.optimizer import normalize_device_matrix, find_optimal_device_batch
+
+
+class DecisionRegionIndex:
+    """
+    Exact answer to "which device wins for weights w" for one comparison category.
+
+    The score of device i for a weight vector w is the dot product of its normalized
+    feature row with w, so device i wins on the convex polyhedral cone
+    {w : (n_i - n_j) . w >= 0 for every other device j}. The index keeps only the
+    normalized device matrix and these half-space constraints, so single lookups do not
+    depend on any grid resolution. The winner is found with `find_optimal_device_batch`,
+    exactly as the grid solver does; the constraints of the winning region give its margin.
+    """
+
+    def __init__(self, names, features, normalized):
+        """
+        Parameters:
+        -----------
+        names : list of str
+            Device names, in the order of the rows of `normalized`.
+        features : list of str
+            Feature names, in the order of the columns of `normalized`.
+        normalized : np.ndarray
+            Min-max normalized device matrix of shape (n_devices, n_features).
+        """
+        self.names = list(names)
+        self.features = list(features)
+        self.normalized = np.asarray(normalized, dtype=float)
+        self._constraints = np.stack([
+            self.normalized[i] - np.delete(self.normalized, i, axis=0)
+            for i in range(len(self.names))
+        ])
+        self.regions = dict(zip(self.names, self._constraints))
+
+    @classmethod
+    def from_device_table(cls, df, features):
+        """
+        Build the index from a device summary table, e.g. `Kitchen.compare_coffee_devices()`.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            DataFrame containing device information ('name' column) and feature values.
+        features : list of str
+            List of feature column names that receive weights.
+
+        Returns:
+        --------
+        DecisionRegionIndex
+        """
+        return cls(df["name"].tolist(), features, normalize_device_matrix(df, features))
+
+    def _weight_matrix(self, weights):
+        if isinstance(weights, dict):
+            unknown = sorted(set(weights) - set(self.features))
+            if unknown:
+                raise KeyError(f"Unknown features {unknown}, expected a subset of {self.features}")
+            weights = [[weights.get(feature, 0.0) for feature in self.features]]
+        weight_matrix = np.atleast_2d(np.asarray(weights, dtype=float))
+        if weight_matrix.shape[1] != len(self.features):
+            raise ValueError(f"Expected {len(self.features)} weights, got {weight_matrix.shape[1]}")
+        l1_norm = np.abs(weight_matrix).sum(axis=1, keepdims=True)
+        if np.any(l1_norm == 0):
+            raise ValueError("At least one weight must be non-zero")
+        return weight_matrix / np.where(np.isclose(l1_norm, 1.0), 1.0, l1_norm)
+
+    def lookup_batch(self, weight_matrix):
+        """
+        Vectorized `lookup` for many weight vectors at once.
+
+        Parameters:
+        -----------
+        weight_matrix : np.ndarray
+            Array of shape (n_weights, n_features). Rows are rescaled to an absolute sum of 1.
+
+        Returns:
+        --------
+        tuple of (np.ndarray, np.ndarray, np.ndarray)
+            Optimal device names, their scores and their margins, one entry per row.
+        """
+        return self._lookup(self._weight_matrix(weight_matrix))
+
+    def _lookup(self, weight_matrix):
+        # weight_matrix is already rescaled by _weight_matrix; the device matrix is the one stored on the index
+        best, best_scores = find_optimal_device_batch(self.normalized, weight_matrix)
+        if len(self.names) > 1:
+            # (n_i - n_j) . w for the winning device i against every other device j
+            margins = np.einsum("rjf,rf->rj", self._constraints[best], weight_matrix).min(axis=1)
+        else:
+            margins = np.full(len(best), np.inf)
+        return np.asarray(self.names, dtype=object)[best], best_scores, margins
+
+    def lookup(self, weights):
+        """
+        Find the optimal device for a single weight vector.
+
+        Parameters:
+        -----------
+        weights : dict or sequence of float
+            Mapping from feature name to weight (missing features weigh 0, unknown features
+            raise KeyError), or weights in the order of `features`. Any non-zero vector is
+            accepted and rescaled to an absolute sum of 1, so raw slider positions can be
+            passed directly.
+
+        Returns:
+        --------
+        tuple of (str, float, float)
+            The optimal device, its score (as in `find_optimal_device`) and its margin,
+            i.e. how far its score is ahead of the runner-up. A margin of 0 means the
+            weights lie on the boundary between two regions; ties go to the first device.
+        """
+        names, scores, margins = self._lookup(self._weight_matrix(weights))
+        return names[0], float(scores[0]), float(margins[0])
+
+    def contains(self, device, weights):
+        """
+        Check whether the weights lie in the (closed) region where `device` wins.
+        """
+        return bool(np.all(self.regions[device] @ self._weight_matrix(weights)[0] >= 0))
+
+
+def build_decision_indices(datasets):
+    """
+    Build a `DecisionRegionIndex` for every comparison category.
+
+    Parameters:
+    -----------
+    datasets : dict
+        Mapping from category name to a tuple (device summary DataFrame, list of features),
+        e.g. `src.pipelines.generate_grid.category_datasets()`.
+
+    Returns:
+    --------
+    dict
+        Mapping from category name to its `DecisionRegionIndex`.
+    """
+    return {
+        name: DecisionRegionIndex.from_device_table(df, features)
+        for name, (df, features) in datasets.items()
+    }
@@ -1,11 +1,145 @@
 import pandas as pd
 import numpy as np
-import itertools
+import pyarrow as pa
+import pyarrow.parquet as pq
+from functools import lru_cache
 from joblib import Parallel, delayed
 import sys
 import os
+import tempfile
 sys.path.append(os.path.abspath(os.path.join("../")))
-from src.comparisons.optimizer import find_optimal_device
+from src.comparisons.optimizer import (
+    find_optimal_device,
+    find_optimal_device_batch,
+    normalize_device_matrix,
+)
+
+
+def _units_per_weight(step):
+    """
+    Number of `step` units that make up a weight of 1, i.e. the L1 budget of every combination.
+    """
+    n_units = int(round(1 / step))
+    if n_units < 1 or not np.isclose(n_units * step, 1.0):
+        raise ValueError(f"step must divide 1 into whole units, got {step}")
+    return n_units
+
+
+@lru_cache(maxsize=None)
+def _count_signed_compositions(n_features, budget):
+    """
+    Count integer vectors of length `n_features` whose absolute values sum to `budget`.
+    """
+    if n_features == 0:
+        return int(budget == 0)
+    return sum(
+        _count_signed_compositions(n_features - 1, budget - abs(v))
+        for v in range(-budget, budget + 1)
+    )
+
+
+@lru_cache(maxsize=64)
+def _signed_compositions(n_features, budget):
+    """
+    Materialize all integer vectors of length `n_features` whose absolute values sum to
+    `budget`, in lexicographic order. The returned array is read-only because it is cached.
+    """
+    if n_features == 0:
+        result = np.zeros((int(budget == 0), 0), dtype=np.int16)
+    else:
+        parts = []
+        for v in range(-budget, budget + 1):
+            rest = _signed_compositions(n_features - 1, budget - abs(v))
+            part = np.empty((len(rest), n_features), dtype=np.int16)
+            part[:, 0] = v
+            part[:, 1:] = rest
+            parts.append(part)
+        result = np.concatenate(parts)
+    result.flags.writeable = False
+    return result
+
+
+def _iter_signed_compositions(n_features, budget, max_rows, skip=0):
+    """
+    Yield the vectors of `_signed_compositions` in lexicographic order, in chunks of at most
+    `max_rows` rows (or the smallest subproblem if it is larger), without building the full set.
+    The first `skip` vectors are left out; whole subproblems are skipped by their count, so
+    starting deep into the sequence costs no more than starting at the beginning.
+    """
+    if n_features <= 1 or _count_signed_compositions(n_features, budget) <= max_rows:
+        yield _signed_compositions(n_features, budget)[skip:]
+        return
+    for v in range(-budget, budget + 1):
+        n_rest = _count_signed_compositions(n_features - 1, budget - abs(v))
+        if skip >= n_rest:
+            skip -= n_rest
+            continue
+        for rest in _iter_signed_compositions(n_features - 1, budget - abs(v), max_rows, skip):
+            chunk = np.empty((len(rest), n_features), dtype=np.int16)
+            chunk[:, 0] = v
+            chunk[:, 1:] = rest
+            yield chunk
+        skip = 0
+
+
+def count_weight_combinations(n_features, step=0.5):
+    """
+    Count the valid weight combinations without generating them.
+
+    Parameters:
+    -----------
+    n_features : int
+        Number of features that receive a weight.
+    step : float, optional (default=0.5)
+        Step size of the weight values between -1 and 1. 1 / step must be a whole number.
+
+    Returns:
+    --------
+    int
+        Number of weight vectors with values in {-1, ..., -step, 0, step, ..., 1}
+        whose absolute values sum to 1.
+    """
+    return _count_signed_compositions(n_features, _units_per_weight(step))
+
+
+def iter_weight_blocks(n_features, step=0.5, block_size=65536, start_block=0):
+    """
+    Stream all valid weight combinations as fixed-size NumPy blocks.
+
+    The combinations are enumerated directly as signed compositions of the L1 budget
+    (1 / step units spread over the features, each with a sign), so no invalid vector is
+    ever built and memory stays bounded by `block_size` regardless of the number of features.
+    Rows come in the same lexicographic order as `itertools.product` over the weight values.
+
+    Parameters:
+    -----------
+    n_features : int
+        Number of features that receive a weight.
+    step : float, optional (default=0.5)
+        Step size of the weight values between -1 and 1. 1 / step must be a whole number.
+    block_size : int, optional (default=65536)
+        Number of rows per yielded block. Only the last block may be shorter.
+    start_block : int, optional (default=0)
+        Index of the first block to yield. Earlier blocks are skipped without being generated.
+
+    Yields:
+    -------
+    np.ndarray
+        Array of shape (block_size, n_features) with weights whose absolute values sum to 1.
+    """
+    n_units = _units_per_weight(step)
+    pending = []
+    n_pending = 0
+    for chunk in _iter_signed_compositions(n_features, n_units, block_size, skip=start_block * block_size):
+        pending.append(chunk)
+        n_pending += len(chunk)
+        while n_pending >= block_size:
+            units = np.concatenate(pending)
+            yield units[:block_size] / n_units
+            pending = [units[block_size:]]
+            n_pending -= block_size
+    if n_pending:
+        yield np.concatenate(pending) / n_units
 
 
 def generate_weight_combinations(features, step=0.5):
@@ -14,7 +148,7 @@ def generate_weight_combinations(features, step=0.5):
 
     Each weight can take values in the range [-1, 1] with the specified step size.
     Only combinations where the sum of the absolute values of weights equals 1
-    (i.e., normalized importance distribution) are retained.
+    (i.e., normalized importance distribution) are generated, see `iter_weight_blocks`.
 
     Parameters:
     -----------
@@ -29,13 +163,9 @@ def generate_weight_combinations(features, step=0.5):
         List of valid weight combinations (tuples of floats) that satisfy the constraint.
     """
 
-    n_steps = int(2 / step) + 1  
-    possible_weights = np.linspace(-1, 1, n_steps)
-    combinations = itertools.product(possible_weights, repeat=len(features))
-    valid_combinations = [
-        comb for comb in combinations if np.isclose(sum(abs(w) for w in comb), 1.0)
+    return [
+        tuple(row) for block in iter_weight_blocks(len(features), step) for row in block
     ]
-    return valid_combinations
 
 
 
@@ -71,13 +201,328 @@ def evaluate_combination(df, features, weights_tuple):
 
 
 
-def compute_all_combinations_parallel(df, features, step=0.5, n_jobs=-1):
+def solve_weight_grid(df, features, weight_matrix):
+    """
+    Score every device for every weight configuration as one weight-by-device matrix product.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame containing device information ('name' column) and feature values.
+    features : list of str
+        List of feature column names, in the same order as the weight matrix columns.
+    weight_matrix : np.ndarray
+        Array of shape (n_weights, n_features), one weight configuration per row.
+
+    Returns:
+    --------
+    tuple of (np.ndarray, np.ndarray)
+        Names of the optimal devices and their scores, one entry per weight row.
+        Exact ties are resolved in favour of the device listed first in `df`.
+    """
+    best, scores = find_optimal_device_batch(normalize_device_matrix(df, features), weight_matrix)
+    return df["name"].to_numpy()[best], scores
+
+
+@lru_cache(maxsize=None)
+def _numba_grid_kernel():
+    """
+    Compile (once per process) the numba kernel used by the 'numba' grid backend.
+
+    The kernel scores every device for every row of a weight block and keeps the winner,
+    with the rows split over all cores by `prange`. Scores are accumulated feature by
+    feature, in the same order as `score_weight_matrix`, so the results are bit-identical
+    to the 'numpy' backend, ties included.
+
+    Returns:
+    --------
+    callable
+        kernel(normalized, weight_matrix, best, best_score) filling `best` (device index)
+        and `best_score` in place.
+    """
+    import numba
+
+    @numba.njit(parallel=True)
+    def kernel(normalized, weight_matrix, best, best_score):
+        n_devices, n_features = normalized.shape
+        for i in numba.prange(weight_matrix.shape[0]):
+            top = 0
+            top_score = -np.inf
+            for d in range(n_devices):
+                score = 0.0
+                for j in range(n_features):
+                    score += weight_matrix[i, j] * normalized[d, j]
+                if score > top_score:
+                    top = d
+                    top_score = score
+            best[i] = top
+            best_score[i] = top_score
+
+    return kernel
+
+
+def _iter_solved_blocks(df, features, step, block_size, start_block, backend):
+    """
+    Yield (weight_matrix, best, optimal_score) for every weight block from `start_block` on,
+    where `best` holds row indices into `df`. Shared by `iter_grid_blocks` and `iter_grid_batches`.
+    """
+    if backend not in ("numpy", "numba"):
+        raise ValueError(f"Unknown backend: {backend}")
+    kernel = _numba_grid_kernel() if backend == "numba" else None
+
+    normalized = normalize_device_matrix(df, features)
+    buffer = scratch = None
+    for weight_matrix in iter_weight_blocks(len(features), step, block_size, start_block):
+        if kernel is not None:
+            best = np.empty(len(weight_matrix), dtype=np.int64)
+            optimal_score = np.empty(len(weight_matrix))
+            kernel(normalized, weight_matrix, best, optimal_score)
+        else:
+            if buffer is None or buffer.shape[0] != len(weight_matrix):
+                buffer = np.empty((len(weight_matrix), len(df)))
+                scratch = np.empty_like(buffer)
+            best, optimal_score = find_optimal_device_batch(normalized, weight_matrix, out=buffer, scratch=scratch)
+        yield weight_matrix, best, optimal_score
+
+
+def iter_grid_blocks(df, features, step=0.5, block_size=65536, start_block=0, backend="numpy"):
+    """
+    Stream the optimal device for all valid weight combinations, one block at a time.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with device data and relevant features.
+    features : list of str
+        List of feature column names for weight assignment.
+    step : float, optional (default=0.5)
+        Step size for generating possible weight values between -1 and 1.
+    block_size : int, optional (default=65536)
+        Number of weight combinations per block, see `iter_weight_blocks`.
+    start_block : int, optional (default=0)
+        Number of leading blocks to skip without scoring them, used to resume a grid.
+    backend : {'numpy', 'numba'}, optional (default='numpy')
+        'numpy' scores each block with `find_optimal_device_batch`; 'numba' uses the compiled
+        kernel from `_numba_grid_kernel`, which spreads the rows of a block over all cores.
+
+    Yields:
+    -------
+    pd.DataFrame
+        Block of rows with the weights, the selected optimal device and its score.
+    """
+    names = df["name"].to_numpy()
+    for weight_matrix, best, optimal_score in _iter_solved_blocks(df, features, step, block_size, start_block, backend):
+        block = pd.DataFrame(weight_matrix, columns=features)
+        block["optimal_device"] = names[best]
+        block["optimal_score"] = optimal_score
+        yield block
+
+
+def grid_arrow_schema(features, names, step, weight_format="float32"):
+    """
+    Build the Arrow schema of a grid file.
+
+    Parameters:
+    -----------
+    features : list of str
+        Weight column names.
+    names : sequence of str
+        Device names of the category, i.e. the dictionary of 'optimal_device'.
+    step : float
+        Step size of the weight grid, stored in the schema metadata.
+    weight_format : {'float32', 'int8'}, optional (default='float32')
+        'float32' stores the weights themselves; 'int8' stores signed step indices
+        (weight * units per weight), decoded by `read_grid_parquet`.
+
+    Returns:
+    --------
+    pa.Schema
+        Weight columns, a dictionary-encoded 'optimal_device' column and a float64 'optimal_score'.
+    """
+    if weight_format not in ("float32", "int8"):
+        raise ValueError(f"Unknown weight format: {weight_format}")
+    n_units = _units_per_weight(step)
+    if weight_format == "int8" and n_units > np.iinfo(np.int8).max:
+        raise ValueError(f"step={step} is too fine for int8 step indices")
+
+    weight_type = pa.float32() if weight_format == "float32" else pa.int8()
+    index_type = pa.from_numpy_dtype(np.min_scalar_type(-len(names)))
+    fields = [pa.field(feature, weight_type) for feature in features]
+    fields.append(pa.field("optimal_device", pa.dictionary(index_type, pa.string())))
+    fields.append(pa.field("optimal_score", pa.float64()))
+    return pa.schema(fields, metadata={
+        "grid_step": repr(step),
+        "grid_units_per_weight": str(n_units),
+        "grid_weight_format": weight_format,
+    })
+
+
+def iter_grid_batches(df, features, step=0.5, block_size=65536, start_block=0, backend="numpy",
+                      weight_format="float32"):
+    """
+    Stream the grid as Arrow record batches with the compact schema of `grid_arrow_schema`.
+
+    Takes the same parameters as `iter_grid_blocks`, plus `weight_format`. No pandas
+    objects are built: the weights are cast straight to the compact type and the device
+    indices become the dictionary indices of 'optimal_device'.
+
+    Yields:
+    -------
+    pa.RecordBatch
+        One batch per weight block.
+    """
+    names = df["name"].astype(str).tolist()
+    schema = grid_arrow_schema(features, names, step, weight_format)
+    n_units = _units_per_weight(step)
+    dictionary = pa.array(names, pa.string())
+    index_type = schema.field("optimal_device").type.index_type
+    for weight_matrix, best, optimal_score in _iter_solved_blocks(df, features, step, block_size, start_block, backend):
+        if weight_format == "int8":
+            weights = np.rint(weight_matrix * n_units).astype(np.int8)
+        else:
+            weights = weight_matrix.astype(np.float32)
+        columns = [pa.array(weights[:, j]) for j in range(len(features))]
+        columns.append(pa.DictionaryArray.from_arrays(pa.array(best.astype(index_type.to_pandas_dtype())), dictionary))
+        columns.append(pa.array(optimal_score))
+        yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_grid_parquet(df, features, path, step=0.5, block_size=65536, backend="numpy", weight_format="float32"):
+    """
+    Write the full grid of a category to one Parquet file, one row group per weight block.
+
+    Only one block is held in memory at a time, so fine-step grids can be written on
+    machines that could not hold the whole table.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with device data and relevant features.
+    features : list of str
+        List of feature column names for weight assignment.
+    path : str or Path
+        Target Parquet file.
+    step, block_size, backend, weight_format :
+        See `iter_grid_blocks` and `grid_arrow_schema`.
+
+    Returns:
+    --------
+    int
+        Number of rows written.
+    """
+    schema = grid_arrow_schema(features, df["name"].astype(str).tolist(), step, weight_format)
+    n_rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in iter_grid_batches(df, features, step, block_size, backend=backend, weight_format=weight_format):
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+    return n_rows
+
+
+def read_grid_parquet(path, columns=None):
+    """
+    Read a grid file written by `write_grid_parquet` back into pandas.
+
+    Int8 step indices are decoded to float weights using the step stored in the file, and
+    'optimal_device' is returned as a categorical column.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Grid Parquet file.
+    columns : list of str, optional
+        Subset of columns to read.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The grid; weights stay float32 in float32 grids, int8 step indices are decoded to float64.
+    """
+    table = pq.read_table(path, columns=columns)
+    metadata = table.schema.metadata or {}
+    df = table.to_pandas()
+    if metadata.get(b"grid_weight_format") == b"int8":
+        n_units = int(metadata[b"grid_units_per_weight"])
+        for column in df.columns:
+            if df[column].dtype == np.int8:
+                df[column] = df[column] / n_units
+    return df
+
+
+def _solve_weight_block(folder, n_features, step, block_size, block):
+    """
+    Worker of the 'joblib' backend: score weight block number `block` of `iter_weight_blocks`.
+
+    The normalized device table is memory-mapped from `folder` and the worker generates its
+    own weight block, so only the block number travels to the worker and only the compact
+    result travels back.
+
+    Returns:
+    --------
+    tuple of (np.ndarray, np.ndarray)
+        Index of the optimal device (smallest integer dtype that fits) and its score.
+    """
+    normalized = np.load(os.path.join(folder, "normalized.npy"), mmap_mode="r")
+    weight_matrix = next(iter_weight_blocks(n_features, step, block_size, start_block=block))
+    best, scores = find_optimal_device_batch(np.asarray(normalized), weight_matrix)
+    return best.astype(np.min_scalar_type(normalized.shape[0] - 1)), scores
+
+
+def _compute_grid_shared(df, features, step, n_jobs, block_size=65536):
+    """
+    Run the grid search on joblib workers that share the device table.
+
+    The normalized device matrix is written once to a memory-mapped `.npy` file; workers
+    receive only block numbers and generate their weight blocks with `iter_weight_blocks`,
+    so no process holds the weight space beyond its own block until the results are joined.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with device data and relevant features.
+    features : list of str
+        List of feature column names for weight assignment.
+    step : float
+        Step size for generating possible weight values between -1 and 1.
+    n_jobs : int
+        Number of parallel jobs to run.
+    block_size : int, optional (default=65536)
+        Number of weight combinations per worker task.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Same table as the 'numpy' backend of `compute_all_combinations_parallel`.
+    """
+    n_weights = count_weight_combinations(len(features), step)
+    n_blocks = -(-n_weights // block_size)
+    with tempfile.TemporaryDirectory(prefix="grid-") as folder:
+        np.save(os.path.join(folder, "normalized.npy"), normalize_device_matrix(df, features))
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_solve_weight_block)(folder, len(features), step, block_size, block)
+            for block in range(n_blocks)
+        )
+
+    # The weight columns of the result are generated once more, straight into the output array
+    weights = np.empty((n_weights, len(features)))
+    offset = 0
+    for block in iter_weight_blocks(len(features), step, block_size):
+        weights[offset:offset + len(block)] = block
+        offset += len(block)
+    grid = pd.DataFrame(weights, columns=features, copy=False)
+    best = np.concatenate([best for best, _ in results])
+    grid["optimal_device"] = df["name"].to_numpy()[best]
+    grid["optimal_score"] = np.concatenate([scores for _, scores in results])
+    return grid
+
+
+def compute_all_combinations_parallel(df, features, step=0.5, n_jobs=-1, backend="numpy"):
     """
     Compute the optimal device for all valid combinations of feature weights in parallel.
 
-    This function generates all normalized weight combinations using `generate_weight_combinations`,
-    evaluates each combination using `evaluate_weight_configuration`, and collects results
-    using parallel computation for speed.
+    This function streams all normalized weight combinations from `iter_weight_blocks`,
+    scores every combination against the device table, and collects the optimal device per
+    combination.
 
     Parameters:
     -----------
@@ -89,17 +534,28 @@ def compute_all_combinations_parallel(df, features, step=0.5, n_jobs=-1):
         Step size for generating possible weight values between -1 and 1.
     n_jobs : int, optional (default=-1)
         Number of parallel jobs to run. Use -1 to utilize all available CPUs.
+        Only used by the 'joblib' backend.
+    backend : {'numpy', 'numba', 'joblib'}, optional (default='numpy')
+        'numpy' scores whole blocks of weight configurations with `find_optimal_device_batch`;
+        'numba' runs the compiled parallel kernel over the same blocks (requires numba);
+        'joblib' splits the weight space into blocks scored by worker processes that share the
+        device table through a memory-mapped file and generate their own weight blocks,
+        see `_compute_grid_shared`.
 
     Returns:
     --------
     pd.DataFrame
         DataFrame where each row corresponds to a weight configuration,
         the selected optimal device, and its score.
+
+    Notes:
+    ------
+    Every backend returns the same device as `find_optimal_device` for every row
+    (see tests/test_grid_backends.py). Exact score ties are resolved in favour of the device
+    listed first in `df`. Before `find_optimal_device` used a stable sort, ties were resolved
+    arbitrarily, so grids generated earlier may differ on tied rows (about 0.1% of 'heating').
     """
 
-    weight_combinations = generate_weight_combinations(features, step)
-    results = Parallel(n_jobs=n_jobs)(
-        delayed(evaluate_combination)(df, features, weights_tuple) 
-        for weights_tuple in weight_combinations
-    )
-    return pd.DataFrame(results)
\ No newline at end of file
+    if backend == "joblib":
+        return _compute_grid_shared(df, features, step, n_jobs)
+    return pd.concat(iter_grid_blocks(df, features, step, backend=backend), ignore_index=True)
@@ -2,7 +2,8 @@
 # import os
 # sys.path.append(os.path.abspath(os.path.join("../../")))
 
-import pandas as pd
+from src.comparisons.kernel import comparison_table
+from src.comparisons.cache import memoize_comparison
 from src.appliances.cooking import Kettle, InductionHob, GasHob
 from src.appliances.ovens import Microwave, ElectricOven, AirFryer, GasOven
 from src.appliances.coffee import ElectricMokaPot, CoffeeMachine
@@ -20,44 +21,50 @@ class Kitchen:
     """
 
     @staticmethod
-    def compare_water_boiling_devices(liters=1.0):
+    def water_boiling_devices(liters=1.0):
         """
-        Compares kettle, induction hob, and gas hob for boiling a given amount of water.
+        Builds the kettle, induction hob and gas hob used to boil a given amount of water.
 
         Parameters:
-            liters (float): Volume of water to boil in liters.
+            liters (float or array): Volume of water to boil in liters.
 
         Returns:
-            pd.DataFrame: Summary of each appliance including energy, cost, time, comfort, CO2, etc.
+            list[Appliance]: Devices compared in `compare_water_boiling_devices`.
         """
-        devices = [
+        return [
             Kettle(liters, comfort_penalty=0.1, failure_rate=0.6),
             InductionHob(liters, comfort_penalty=0.05, failure_rate=0.2),
             GasHob(liters, comfort_penalty=0.15, failure_rate=0.2)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
+    @staticmethod
+    @memoize_comparison
+    def compare_water_boiling_devices(liters=1.0, price_per_kwh=None, emission_factor=None):
+        """
+        Compares kettle, induction hob, and gas hob for boiling a given amount of water.
 
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
+        Parameters:
+            liters (float): Volume of water to boil in liters.
+            price_per_kwh (float or array, optional): Electricity tariff (PLN/kWh) used to re-price electric devices;
+                an array gives one block of rows per tariff.
+            emission_factor (float or array, optional): Grid emission factor (kg CO2/kWh) for electric devices.
 
-        return pd.DataFrame(results)
+        Returns:
+            pd.DataFrame: Summary of each appliance including energy, cost, time, comfort, CO2, etc.
+        """
+        devices = Kitchen.water_boiling_devices(liters)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
     
     @staticmethod
-    def compare_cooking_devices(time_minutes=30):
+    def cooking_devices(time_minutes=30):
         """
-        Compares GasHob and InductionHob for cooking tasks (not just boiling water).
+        Builds GasHob and InductionHob set up for cooking tasks (not just boiling water).
 
         Parameters:
-            time_minutes (float): Duration of cooking.
+            time_minutes (float or array): Duration of cooking.
 
         Returns:
-            pd.DataFrame: Summary including energy, cost, comfort, etc.
+            list[Appliance]: Devices compared in `compare_cooking_devices`.
         """
         # Assume 1.8kW power for induction, 2.0kW equivalent thermal power for gas
         induction = InductionHob(liters=0, comfort_penalty=0.05, failure_rate=0.12)
@@ -69,215 +76,218 @@ class Kitchen:
         gas.operation_time= lambda: time_minutes
         gas.cost = lambda: round(gas.energy_consumption() * 2.80 / 9.5, 2)  # m3 gas cost
 
-        devices = [induction, gas]
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
+        return [induction, gas]
+
+    @staticmethod
+    @memoize_comparison
+    def compare_cooking_devices(time_minutes=30, price_per_kwh=None, emission_factor=None):
+        """
+        Compares GasHob and InductionHob for cooking tasks (not just boiling water).
 
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
+        Parameters:
+            time_minutes (float): Duration of cooking.
+            price_per_kwh (float or array, optional): Electricity tariff (PLN/kWh) used to re-price electric devices;
+                an array gives one block of rows per tariff.
+            emission_factor (float or array, optional): Grid emission factor (kg CO2/kWh) for electric devices.
 
-        return pd.DataFrame(results)
+        Returns:
+            pd.DataFrame: Summary including energy, cost, comfort, etc.
+        """
+        devices = Kitchen.cooking_devices(time_minutes)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
     
     @staticmethod
-    def compare_heating_devices(time_minutes=10):
+    def food_heating_devices(time_minutes=10):
         """
-        Compares food heating devices: microwave, electric oven, air fryer, and gas oven.
+        Builds the microwave, electric oven, air fryer and gas oven used to heat food.
 
         Parameters:
-            time_minutes (float): Duration of actual heating (excluding preheating, which is handled internally
-                                for relevant appliances).
+            time_minutes (float or array): Duration of actual heating (excluding preheating).
 
         Returns:
-            pd.DataFrame: Summary table including key metrics for each device such as energy consumption (kWh),
-                        cost (PLN), operation time (minutes), comfort penalty, CO2 emissions, heating quality,
-                        normalized comfort and failure rates, and more.
+            list[Appliance]: Devices compared in `compare_heating_devices`.
         """
-        devices = [
+        return [
             Microwave(time_minutes=time_minutes, comfort_penalty=0.05, failure_rate=0.08, heating_quality=0.4),
             ElectricOven(time_minutes=time_minutes, comfort_penalty=0.15, failure_rate=0.12, heating_quality=0.7),
             AirFryer(time_minutes=time_minutes, comfort_penalty=0.1, failure_rate=0.1, heating_quality=0.7),
             GasOven(time_minutes=time_minutes, comfort_penalty=0.2, failure_rate=0.1, heating_quality=0.9)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
+    @staticmethod
+    @memoize_comparison
+    def compare_heating_devices(time_minutes=10, price_per_kwh=None, emission_factor=None):
+        """
+        Compares food heating devices: microwave, electric oven, air fryer, and gas oven.
 
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
+        Parameters:
+            time_minutes (float): Duration of actual heating (excluding preheating, which is handled internally
+                                for relevant appliances).
+            price_per_kwh (float or array, optional): Electricity tariff (PLN/kWh) used to re-price electric devices;
+                an array gives one block of rows per tariff.
+            emission_factor (float or array, optional): Grid emission factor (kg CO2/kWh) for electric devices.
 
-        return pd.DataFrame(results)
+        Returns:
+            pd.DataFrame: Summary table including key metrics for each device such as energy consumption (kWh),
+                        cost (PLN), operation time (minutes), comfort penalty, CO2 emissions, heating quality,
+                        normalized comfort and failure rates, and more.
+        """
+        devices = Kitchen.food_heating_devices(time_minutes)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
     
     @staticmethod
-    def compare_coffee_devices(cups=1):
+    def coffee_devices(cups=1):
         """
-        Compares coffee-making appliances: electric moka pot and coffee machine.
+        Builds the electric moka pot and coffee machine.
 
         Parameters:
-            cups (int): Number of coffee cups to prepare.
+            cups (int or array): Number of coffee cups to prepare.
 
         Returns:
-            pd.DataFrame: Summary of energy use, cost, time, comfort, coffee taste, etc.
+            list[Appliance]: Devices compared in `compare_coffee_devices`.
         """
-        devices = [
+        return [
             ElectricMokaPot(cups=cups, comfort_penalty=0.1, failure_rate=0.08, coffee_taste=0.78),
             CoffeeMachine(cups=cups, comfort_penalty=0.05, failure_rate=0.05, coffee_taste=0.9)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
+    @staticmethod
+    @memoize_comparison
+    def compare_coffee_devices(cups=1, price_per_kwh=None, emission_factor=None):
+        """
+        Compares coffee-making appliances: electric moka pot and coffee machine.
 
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
+        Parameters:
+            cups (int): Number of coffee cups to prepare.
+            price_per_kwh (float or array, optional): Electricity tariff (PLN/kWh) used to re-price electric devices;
+                an array gives one block of rows per tariff.
+            emission_factor (float or array, optional): Grid emission factor (kg CO2/kWh) for electric devices.
 
-        return pd.DataFrame(results)
+        Returns:
+            pd.DataFrame: Summary of energy use, cost, time, comfort, coffee taste, etc.
+        """
+        devices = Kitchen.coffee_devices(cups)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
     
     @staticmethod
-    def compare_multicookers(recipe_complexity=1.0):
+    def multicooker_devices(recipe_complexity=1.0):
         """
-        Compares smart cooking appliances like Thermomix TM6 and Bosch Cookit.
+        Builds the Thermomix TM6 and Bosch Cookit.
 
         Parameters:
-            recipe_complexity (float): 1.0 is standard; higher = longer/more energy-intensive recipes.
+            recipe_complexity (float or array): 1.0 is standard; higher = longer/more energy-intensive recipes.
 
         Returns:
-            pd.DataFrame: Summary of energy use, cost, cooking quality, etc.
+            list[Appliance]: Devices compared in `compare_multicookers`.
         """
-        devices = [
+        return [
             ThermomixTM6(recipe_complexity=recipe_complexity),
             BoschCookit(recipe_complexity=recipe_complexity)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
+    @staticmethod
+    @memoize_comparison
+    def compare_multicookers(recipe_complexity=1.0, price_per_kwh=None, emission_factor=None):
+        """
+        Compares smart cooking appliances like Thermomix TM6 and Bosch Cookit.
 
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
+        Parameters:
+            recipe_complexity (float): 1.0 is standard; higher = longer/more energy-intensive recipes.
+            price_per_kwh (float or array, optional): Electricity tariff (PLN/kWh) used to re-price electric devices;
+                an array gives one block of rows per tariff.
+            emission_factor (float or array, optional): Grid emission factor (kg CO2/kWh) for electric devices.
 
-        return pd.DataFrame(results)
+        Returns:
+            pd.DataFrame: Summary of energy use, cost, cooking quality, etc.
+        """
+        devices = Kitchen.multicooker_devices(recipe_complexity)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
 
 
 class Bathroom:
     @staticmethod
-    def compare_water_heaters(liters=50):
+    def water_heater_devices(liters=50):
         """
-        Compares different water heating devices: Electric Heater, Gas Heater, Flow Heater, and Heat Pump.
+        Builds the Electric Heater, Gas Heater, Flow Heater and Heat Pump.
         Parameters:
-            liters (float): Volume of water to heat in liters.
+            liters (float or array): Volume of water to heat in liters.
         """
-        devices = [
+        return [
             ElectricHeater(liters=liters),
             GasHeater(liters=liters),
             FlowHeater(liters=liters),
             HeatPump(liters=liters)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
-
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
-
-        return pd.DataFrame(results)
+    @staticmethod
+    @memoize_comparison
+    def compare_water_heaters(liters=50, price_per_kwh=None, emission_factor=None):
+        """
+        Compares different water heating devices: Electric Heater, Gas Heater, Flow Heater, and Heat Pump.
+        Parameters:
+            liters (float): Volume of water to heat in liters.
+            price_per_kwh (float or array, optional): Electricity tariff (PLN/kWh) used to re-price electric devices;
+                an array gives one block of rows per tariff.
+            emission_factor (float or array, optional): Grid emission factor (kg CO2/kWh) for electric devices.
+        """
+        devices = Bathroom.water_heater_devices(liters)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
     
 
     @staticmethod
-    def compare_bathing_options():
-        devices = [
+    def bathing_devices():
+        return [
             Shower(duration_min=8),
             Bathtub(liters=150)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
-
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
-
-        return pd.DataFrame(results)
+    @staticmethod
+    @memoize_comparison
+    def compare_bathing_options(price_per_kwh=None, emission_factor=None):
+        devices = Bathroom.bathing_devices()
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
     
 
     @staticmethod
-    def compare_bathroom_heating():
-
-        devices = [
+    def bathroom_heating_devices():
+        return [
             LadderHeater(),
             FloorHeating()
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
-
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3)
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3)
-            results.append(summary)
+    @staticmethod
+    @memoize_comparison
+    def compare_bathroom_heating(price_per_kwh=None, emission_factor=None):
 
-        return pd.DataFrame(results)
+        devices = Bathroom.bathroom_heating_devices()
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
 
 
 class Room:
     
     @staticmethod
-    def compare_workstations():
-        devices = [
+    def workstation_devices():
+        return [
             DesktopComputer(),
             LaptopWithMonitor()
         ]
 
-        total_comfort = sum(d.comfort_penalty() for d in devices)
-        total_failure = sum(d.failure_rate() for d in devices)
-
-        results = []
-        for d in devices:
-            summary = d.summary()
-            summary["normalized_comfort"] = round(d.comfort_penalty() / total_comfort, 3)
-            summary["normalized_failure_rate"] = round(d.failure_rate() / total_failure, 3)
-            results.append(summary)
-
-        return pd.DataFrame(results)
+    @staticmethod
+    @memoize_comparison
+    def compare_workstations(price_per_kwh=None, emission_factor=None):
+        devices = Room.workstation_devices()
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
 
 
     @staticmethod
-    def compare_cooling_devices(duration_min=60):
-        devices = [
+    def cooling_devices(duration_min=60):
+        return [
             AirConditioner(duration_min=duration_min),
             Fan(duration_min=duration_min)
         ]
 
-        total_comfort = sum(dev.comfort_penalty() for dev in devices)
-        total_failure = sum(dev.failure_rate() for dev in devices)
-
-        results = []
-        for dev in devices:
-            summary = dev.summary()
-            summary["normalized_comfort"] = round(dev.comfort_penalty() / total_comfort, 3) if total_comfort > 0 else 0
-            summary["normalized_failure_rate"] = round(dev.failure_rate() / total_failure, 3) if total_failure > 0 else 0
-            results.append(summary)
-
-        return pd.DataFrame(results)
+    @staticmethod
+    @memoize_comparison
+    def compare_cooling_devices(duration_min=60, price_per_kwh=None, emission_factor=None):
+        devices = Room.cooling_devices(duration_min)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join("../")))
+from src.appliances.base import as_batch_array
+
+
+def compare_devices(devices, size=1, price_per_kwh=None, emission_factor=None):
+    """
+    Columnar comparison kernel shared by all `compare_*` methods and the sweep engine.
+
+    Evaluates a set of devices for `size` scenarios at once. The devices may hold parameter
+    arrays of length `size` (see `as_batch_array`), so every metric is computed as a whole
+    column, and the normalized comfort and failure rates are computed for all devices in one
+    vectorized step. Electricity-powered devices can be re-priced with a tariff and an emission
+    factor, which also applies to their cost and emissions per kWh of heat; gas devices keep
+    their own modelled cost and emissions.
+
+    Parameters:
+    -----------
+    devices : list of Appliance
+        Devices of one comparison category.
+    size : int, optional (default=1)
+        Number of scenarios. Grows to the length of array overrides, so `size=1` with an array
+        of tariffs evaluates one scenario per tariff.
+    price_per_kwh : float or np.ndarray, optional
+        Electricity tariff per scenario (PLN/kWh). None keeps each device's own cost model.
+    emission_factor : float or np.ndarray, optional
+        Grid emission factor per scenario (kg CO2/kWh). None keeps each device's own model.
+
+    Returns:
+    --------
+    dict
+        Mapping from column name to a typed NumPy array of shape (size, n_devices), in the column
+        order of the `compare_*` tables, ending with 'normalized_comfort' and 'normalized_failure_rate'.
+    """
+    overrides = [value for value in (price_per_kwh, emission_factor) if value is not None]
+    size = np.broadcast_shapes((size,), *(np.shape(value) for value in overrides))[0]
+    # One value per scenario, so the appliance methods always see arrays of shape (size,)
+    if price_per_kwh is not None:
+        price_per_kwh = as_batch_array(np.broadcast_to(np.asarray(price_per_kwh, dtype=float), (size,)))
+    if emission_factor is not None:
+        emission_factor = as_batch_array(np.broadcast_to(np.asarray(emission_factor, dtype=float), (size,)))
+
+    summaries = []
+    for dev in devices:
+        summary = dev.summary()
+        if dev.energy_carrier == "electricity":
+            energy = np.broadcast_to(np.asarray(dev.energy_consumption()), (size,))
+            if price_per_kwh is not None:
+                summary["cost_pln"] = round(as_batch_array(energy * price_per_kwh), 2)
+                if "cost_per_kwh_heat" in summary:
+                    summary["cost_per_kwh_heat"] = dev.cost_per_kwh_heat(price_per_kwh)
+            if emission_factor is not None:
+                summary["co2_emission_kg"] = round(as_batch_array(energy * emission_factor), 3)
+                if "co2_per_kwh_heat" in summary:
+                    summary["co2_per_kwh_heat"] = dev.heating_quality(emission_factor)
+        summaries.append(summary)
+
+    keys = list(dict.fromkeys(key for summary in summaries for key in summary))
+    columns = {
+        key: np.stack([
+            np.broadcast_to(np.asarray(summary.get(key, np.nan)).view(np.ndarray), (size,))
+            for summary in summaries
+        ], axis=1)
+        for key in keys
+    }
+
+    for column, metric in [("normalized_comfort", "comfort_penalty"), ("normalized_failure_rate", "failure_rate")]:
+        values = np.array([getattr(dev, metric)() for dev in devices], dtype=float)
+        total = values.sum()
+        normalized = round(as_batch_array(values / total), 3) if total > 0 else np.zeros_like(values)
+        columns[column] = np.broadcast_to(normalized.view(np.ndarray), (size, len(devices)))
+    return columns
+
+
+def comparison_table(devices, size=1, price_per_kwh=None, emission_factor=None):
+    """
+    Run `compare_devices` and build the summary DataFrame in one step.
+
+    Parameters:
+    -----------
+    devices : list of Appliance
+        Devices of one comparison category.
+    size : int, optional (default=1)
+        Number of scenarios, see `compare_devices`.
+    price_per_kwh, emission_factor : float or np.ndarray, optional
+        See `compare_devices`.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per scenario and device (scenario-major), with the same columns as the
+        `compare_*` tables.
+    """
+    columns = compare_devices(devices, size, price_per_kwh, emission_factor)
+    return pd.DataFrame({key: values.ravel() for key, values in columns.items()})
+
+
+def compare_categories(device_sets, price_per_kwh=None, emission_factor=None):
+    """
+    Compare several categories in one call and build a single DataFrame for all of them.
+
+    Parameters:
+    -----------
+    device_sets : dict
+        Mapping from category name to its list of devices, e.g.
+        {'boiling_water': Kitchen.water_boiling_devices(liters=1.5), ...}.
+    price_per_kwh, emission_factor : float, optional
+        See `compare_devices`.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The rows of every category's comparison table followed by a 'category' column.
+        Metrics that do not apply to a category (e.g. 'coffee_taste') are NaN.
+    """
+    results = {
+        category: compare_devices(devices, 1, price_per_kwh, emission_factor)
+        for category, devices in device_sets.items()
+    }
+    keys = list(dict.fromkeys(key for columns in results.values() for key in columns))
+    merged = {
+        key: np.concatenate([
+            columns[key].ravel() if key in columns else np.full(len(device_sets[category]), np.nan)
+            for category, columns in results.items()
+        ])
+        for key in keys
+    }
+    merged["category"] = np.repeat(list(results), [len(device_sets[category]) for category in results])
+    return pd.DataFrame(merged)
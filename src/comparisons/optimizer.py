@@ -1,6 +1,81 @@
+import numpy as np
 import pandas as pd
 
 
+def normalize_device_matrix(df, features):
+    """
+    Min-max normalize the feature columns of a device table into a NumPy matrix.
+
+    Columns with a constant value across devices are normalized to 0. The matrix can be
+    computed once per device table and reused for every weight configuration.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame containing device information and feature values.
+        features (list[str]): Feature column names to normalize.
+
+    Returns:
+        np.ndarray: Array of shape (n_devices, n_features) with values in the range [0, 1].
+    """
+    values = df[features].to_numpy(dtype=float)
+    col_min = values.min(axis=0)
+    span = values.max(axis=0) - col_min
+    normalized = np.zeros_like(values)
+    varying = span > 0
+    normalized[:, varying] = (values[:, varying] - col_min[varying]) / span[varying]
+    return normalized
+
+
+def score_weight_matrix(normalized, weight_matrix, out=None, scratch=None):
+    """
+    Computes the weighted score of every device for every weight configuration.
+
+    Parameters:
+        normalized (np.ndarray): Normalized device matrix of shape (n_devices, n_features),
+            see `normalize_device_matrix`.
+        weight_matrix (np.ndarray): Array of shape (n_weights, n_features), one weight configuration per row.
+        out (np.ndarray, optional): Preallocated float array of shape (n_weights, n_devices) that
+            receives the scores.
+        scratch (np.ndarray, optional): Preallocated float array of the same shape for the
+            per-feature terms. With both `out` and `scratch` given, repeated calls on equally
+            sized blocks do not allocate.
+
+    Returns:
+        np.ndarray: Array of shape (n_weights, n_devices) with the scores.
+    """
+    weight_matrix = np.asarray(weight_matrix, dtype=float)
+    shape = (weight_matrix.shape[0], normalized.shape[0])
+    scores = np.zeros(shape) if out is None else out
+    if out is not None:
+        scores.fill(0.0)
+    term = np.empty(shape) if scratch is None else scratch
+    # Accumulate feature by feature so the floating-point summation order matches
+    # find_optimal_device and the scores are bit-identical.
+    for j in range(normalized.shape[1]):
+        np.multiply(weight_matrix[:, j, None], normalized[None, :, j], out=term)
+        scores += term
+    return scores
+
+
+def find_optimal_device_batch(normalized, weight_matrix, out=None, scratch=None):
+    """
+    Finds the optimal device for many weight configurations at once, without pandas.
+
+    Parameters:
+        normalized (np.ndarray): Normalized device matrix of shape (n_devices, n_features),
+            see `normalize_device_matrix`.
+        weight_matrix (np.ndarray): Array of shape (n_weights, n_features), one weight configuration per row.
+        out (np.ndarray, optional): Preallocated score buffer, see `score_weight_matrix`.
+        scratch (np.ndarray, optional): Preallocated buffer for the per-feature terms, see `score_weight_matrix`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Row index of the optimal device and its score, one entry
+            per weight configuration. Exact ties are resolved in favour of the device listed first.
+    """
+    scores = score_weight_matrix(normalized, weight_matrix, out=out, scratch=scratch)
+    best = scores.argmax(axis=1)
+    return best, np.take_along_axis(scores, best[:, None], axis=1)[:, 0]
+
+
 def find_optimal_device(df, weights):
     """
     Finds the optimal device based on weighted scores of different criteria.
@@ -11,20 +86,14 @@ def find_optimal_device(df, weights):
 
     Returns:
         pd.DataFrame: Original DataFrame with an added 'score' column, sorted descending by score.
+            The sort is stable, so exact ties keep the device listed first on top, as in
+            `find_optimal_device_batch`.
     """
     if not abs(sum(abs(w) for w in weights.values()) - 1.0) < 1e-6:
         raise ValueError("Absolute sum of weights must be 1.0")
 
-
-    df = df.copy()
-    df["score"] = 0.0
-    for col, weight in weights.items():
-        col_min = df[col].min()
-        col_max = df[col].max()
-        if col_max > col_min:
-            normalized = (df[col] - col_min) / (col_max - col_min)
-        else:
-            normalized = 0
-        df["score"] += normalized * weight
-    df=df.drop(columns=['comfort_penalty', 'failure_rate'],axis=1)
-    return df.sort_values(by="score", ascending=False).reset_index(drop=True)
+    features = list(weights)
+    normalized = normalize_device_matrix(df, features)
+    scores = score_weight_matrix(normalized, [list(weights.values())])[0]
+    df = df.drop(columns=['comfort_penalty', 'failure_rate']).assign(score=scores)
+    return df.sort_values(by="score", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join("../")))
+from src.appliances.base import as_batch_array
+from src.comparisons.household import Kitchen, Bathroom, Room
+from src.comparisons.kernel import compare_devices
+
+
+# Category keys follow src/recommendation_engine/comparing_devices.py
+SWEEP_CATEGORIES = {
+    "boiling_water": Kitchen.water_boiling_devices,
+    "cooking": Kitchen.cooking_devices,
+    "heating_food": Kitchen.food_heating_devices,
+    "making_coffee": Kitchen.coffee_devices,
+    "multicookers": Kitchen.multicooker_devices,
+    "water_heating": Bathroom.water_heater_devices,
+    "bathing": Bathroom.bathing_devices,
+    "bathroom_heating": Bathroom.bathroom_heating_devices,
+    "workstation": Room.workstation_devices,
+    "cooling": Room.cooling_devices,
+}
+
+
+def sweep_category(category, params=None, price_per_kwh=None, emission_factor=None):
+    """
+    Evaluate one comparison category over the cartesian product of its parameter ranges.
+
+    Parameters:
+    -----------
+    category : str
+        Key of `SWEEP_CATEGORIES`, e.g. 'water_heating'.
+    params : dict, optional
+        Mapping from a device-factory parameter (e.g. 'liters') to the values to sweep.
+        Parameters that are not given keep the factory defaults.
+    price_per_kwh : sequence of float, optional
+        Electricity tariffs to sweep. None keeps the modelled costs.
+    emission_factor : sequence of float, optional
+        Grid emission factors to sweep. None keeps the modelled emissions.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per scenario and device with the columns 'category', the swept parameters,
+        'price_per_kwh', 'emission_factor' (when swept) and the device metrics.
+    """
+    axes = dict(params or {})
+    if price_per_kwh is not None:
+        axes["price_per_kwh"] = price_per_kwh
+    if emission_factor is not None:
+        axes["emission_factor"] = emission_factor
+
+    names = list(axes)
+    grids = np.meshgrid(*(np.asarray(axes[name]) for name in names), indexing="ij")
+    scenario = {name: grid.ravel() for name, grid in zip(names, grids)}
+    size = len(next(iter(scenario.values()))) if scenario else 1
+
+    factory_params = {
+        name: as_batch_array(values) for name, values in scenario.items()
+        if name not in ("price_per_kwh", "emission_factor")
+    }
+    devices = SWEEP_CATEGORIES[category](**factory_params)
+    metrics = compare_devices(
+        devices, size,
+        price_per_kwh=scenario.get("price_per_kwh"),
+        emission_factor=scenario.get("emission_factor"),
+    )
+
+    n_devices = len(devices)
+    columns = {"category": np.full(size * n_devices, category)}
+    for name, values in scenario.items():
+        columns[name] = np.repeat(values, n_devices)
+    for key, values in metrics.items():
+        columns[key] = values.ravel()
+    return pd.DataFrame(columns)
+
+
+def build_sweep_cube(scenarios, price_per_kwh=None, emission_factor=None):
+    """
+    Evaluate several comparison categories and stack them into one results cube.
+
+    Parameters:
+    -----------
+    scenarios : dict
+        Mapping from category to its parameter ranges (see `sweep_category`); use an empty
+        dict for categories without scenario parameters.
+    price_per_kwh : sequence of float, optional
+        Electricity tariffs to sweep for every category.
+    emission_factor : sequence of float, optional
+        Grid emission factors to sweep for every category.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Concatenated results; parameters that do not apply to a category are NaN.
+    """
+    return pd.concat([
+        sweep_category(category, params, price_per_kwh, emission_factor)
+        for category, params in scenarios.items()
+    ], ignore_index=True)
+
+
+def write_sweep_cube(cube, path):
+    """
+    Write the results cube as a Parquet dataset partitioned by category.
+
+    Partitions of the categories present in `cube` are replaced, other partitions are kept.
+
+    Parameters:
+    -----------
+    cube : pd.DataFrame
+        Output of `build_sweep_cube`.
+    path : str or Path
+        Target directory of the dataset.
+    """
+    cube.to_parquet(path, partition_cols=["category"], index=False, existing_data_behavior="delete_matching")
@@ -1,4 +1,9 @@
 import polars as pl
+from src.data_processing.integrate_power import with_interval_energy
+from src.data_processing.query_sensor_rollup import EVERY_PATTERN
+
+# Okresy, które są wielokrotnością doby, więc każdy zaczyna się o północy
+DAY_MULTIPLE_UNITS = {"d", "w", "mo", "q", "y"}
 
 
 def aggregate_data_daily(df: pl.DataFrame) -> pl.DataFrame:    
@@ -42,4 +47,49 @@ def aggregate_data_daily(df: pl.DataFrame) -> pl.DataFrame:
         .sort("date")
     )
 
-    return daily_agg
\ No newline at end of file
+    return daily_agg
+
+
+def aggregate_data_daily_lazy(source, every: str = "1d") -> pl.DataFrame:
+    """
+    Aggregate electric sensor data to daily totals straight from Parquet files, out of core.
+
+    Unlike `aggregate_data_daily`, the series is never materialized: the files are scanned
+    lazily, grouped with `group_by_dynamic` on the timestamp and run on the streaming engine,
+    so month-long 1 Hz series of many homes can be aggregated in one call. Power is
+    integrated over the actual interval between readings (see `with_interval_energy`)
+    instead of assuming exactly one sample per second.
+
+    Parameters
+    ----------
+    source : str, Path or list
+        Parquet file, glob (e.g. 'Data/Parquet/household_sensors/home*_electric-mains_*.parquet')
+        or list of files. Each file is one sensor series with the columns 'timestamp' and 'value',
+        sorted by timestamp.
+    every : str, optional
+        Period of the totals as a polars duration in whole days, e.g. '1d' (default), '7d',
+        '1w' or '1mo'. Sub-day periods such as '1h' raise a ValueError; use
+        `query_sensor_rollup` for those.
+
+    Returns
+    -------
+    pl.DataFrame
+        Totals per file and period with the following columns:
+        - 'source_file' : path of the file the series was read from (type: String)
+        - 'date' : start of the period (type: Date)
+        - 'daily_kWh' : energy used in the period (type: Float64)
+    """
+
+    match = EVERY_PATTERN.match(every)
+    if match is None or match.group(2) not in DAY_MULTIPLE_UNITS:
+        raise ValueError(f"Period must be a whole number of days, e.g. '1d', '1w' or '1mo', got: {every}")
+
+    readings = pl.scan_parquet(source, include_file_paths="source_file")
+    daily_agg = (
+        with_interval_energy(readings, by=["source_file"])
+        .group_by_dynamic("timestamp", every=every, group_by="source_file")
+        .agg(pl.col("energy_kWh").sum().alias("daily_kWh"))
+        .select("source_file", pl.col("timestamp").dt.date().alias("date"), "daily_kWh")
+    )
+
+    return daily_agg.collect(engine="streaming")
@@ -8,6 +8,10 @@ def fix_parquet_with_header_data(df: pl.DataFrame) -> pl.DataFrame:
     restores that row, and renames the columns to ['timestamp', 'value']. It changes the
     format of the 'timestamp' column to a Polars Datetime type.
 
+    Files written by the current ingest (`src/pipelines/transform_to_parquet_parallel.py`)
+    are read without a header and already have these columns; they are returned unchanged.
+    Old files can be repaired once, in place, with `transform_to_parquet_parallel.py --repair`.
+
     Parameters
     ----------
     df : pl.DataFrame
@@ -19,6 +23,9 @@ def fix_parquet_with_header_data(df: pl.DataFrame) -> pl.DataFrame:
         A corrected DataFrame with the lost row restored and columns renamed to ['timestamp', 'value'].
     """
 
+    if df.columns == ["timestamp", "value"]:
+        return df
+
     # Save original column names (contain real data)
     first_row_raw = df.columns
 
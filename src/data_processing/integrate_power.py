@@ -0,0 +1,61 @@
+import polars as pl
+
+# Odczyty IDEAL przychodzą co ~1 s; dłuższa przerwa to luka w danych
+NOMINAL_SAMPLE_INTERVAL_S = 1.0
+MAX_SAMPLE_INTERVAL_S = 60.0
+
+
+def with_interval_energy(df: pl.LazyFrame, by: list = None, next_readings: pl.LazyFrame = None) -> pl.LazyFrame:
+    """
+    Add the energy of every power reading, integrated over its actual sample interval.
+
+    Each reading is held until the next reading of the same sensor (left Riemann sum), so
+    irregular sampling is integrated correctly instead of assuming one sample per second.
+    Intervals longer than MAX_SAMPLE_INTERVAL_S are gaps in the data: they are flagged and
+    integrated over at most MAX_SAMPLE_INTERVAL_S. The last reading of a series is held until
+    the series' reading in `next_readings`, or for NOMINAL_SAMPLE_INTERVAL_S without one.
+
+    Parameters
+    ----------
+    df : pl.LazyFrame
+        Readings with a Datetime 'timestamp' and a power 'value' in watts. The rows of
+        each series must be contiguous and sorted by timestamp.
+    by : list, optional
+        Columns identifying a series (e.g. ['sensor_id']); None treats all rows as one series.
+    next_readings : pl.LazyFrame, optional
+        The first reading after the end of each series, with the `by` columns and
+        'next_timestamp', e.g. read from the next month partition, so a series split into
+        partitions is integrated as if it were read whole.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The input with three more columns:
+        - 'interval_s' : seconds until the next reading, capped at MAX_SAMPLE_INTERVAL_S (Float64)
+        - 'is_gap' : True if the next reading came later than MAX_SAMPLE_INTERVAL_S (Boolean)
+        - 'energy_kWh' : value × interval_s / 3_600_000 (Float64)
+    """
+
+    # shift instead of a window over `by`, so the plan stays streamable
+    next_timestamp = pl.col("timestamp").shift(-1)
+    if by:
+        same_series = pl.all_horizontal([pl.col(c) == pl.col(c).shift(-1) for c in by])
+        next_timestamp = pl.when(same_series).then(next_timestamp)
+    if next_readings is not None:
+        # order-preserving join, so the series stay contiguous and sorted
+        if by:
+            df = df.join(next_readings, on=by, how="left", maintain_order="left")
+        else:
+            df = df.join(next_readings, how="cross", maintain_order="left")
+        next_timestamp = next_timestamp.fill_null(pl.col("next_timestamp"))
+    interval = (next_timestamp - pl.col("timestamp")).dt.total_microseconds() / 1_000_000
+
+    df = (
+        df.with_columns(interval.fill_null(NOMINAL_SAMPLE_INTERVAL_S).alias("interval_s"))
+        .with_columns(
+            (pl.col("interval_s") > MAX_SAMPLE_INTERVAL_S).alias("is_gap"),
+            pl.col("interval_s").clip(upper_bound=MAX_SAMPLE_INTERVAL_S),
+        )
+        .with_columns((pl.col("value") * pl.col("interval_s") / 3_600_000).alias("energy_kWh"))
+    )
+    return df if next_readings is None else df.drop("next_timestamp")
@@ -0,0 +1,146 @@
+import re
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+
+# Od najgrubszej do najdrobniejszej: (nazwa, okres polars, jednostki okresu, które rozdzielczość potrafi złożyć)
+RESOLUTIONS = [
+    ("month", "1mo", {"mo", "q", "y"}),
+    ("day", "1d", {"d", "w", "mo", "q", "y"}),
+    ("hour", "1h", {"h", "d", "w", "mo", "q", "y"}),
+    ("minute", "1m", {"m", "h", "d", "w", "mo", "q", "y"}),
+]
+ROLLUP_HIVE_SCHEMA = {"resolution": pl.String, "home_id": pl.Int32, "sensor_category": pl.String, "year_month": pl.String}
+SENSOR_COLS = ["sensor_id", "sensor_name", "room"]
+EVERY_PATTERN = re.compile(r"^(\d+)(mo|m|h|d|w|q|y)$")
+
+
+def rollup_aggregations() -> list:
+    """
+    Expressions merging rollup rows of a finer resolution into coarser periods.
+
+    Returns
+    -------
+    list
+        Aggregations of 'energy_kWh' (sum), 'mean_W' (mean weighted by samples),
+        'max_W' (max), 'samples' (sum) and 'gaps' (sum).
+    """
+
+    return [
+        pl.col("energy_kWh").sum(),
+        ((pl.col("mean_W") * pl.col("samples")).sum() / pl.col("samples").sum()).alias("mean_W"),
+        pl.col("max_W").max(),
+        pl.col("samples").sum(),
+        pl.col("gaps").sum(),
+    ]
+
+
+def is_aligned(moment: datetime, resolution: str) -> bool:
+    """
+    Check whether a query bound falls on a period boundary of the given resolution.
+    """
+
+    if moment is None:
+        return True
+    parts = {
+        "month": (moment.day - 1, moment.hour, moment.minute, moment.second, moment.microsecond),
+        "day": (moment.hour, moment.minute, moment.second, moment.microsecond),
+        "hour": (moment.minute, moment.second, moment.microsecond),
+        "minute": (moment.second, moment.microsecond),
+    }[resolution]
+    return not any(parts)
+
+
+def choose_rollup_resolution(every: str, start: datetime = None, end: datetime = None) -> str:
+    """
+    Pick the coarsest rollup that can answer a query exactly.
+
+    A rollup can be used when every requested period is a whole number of its periods
+    and the query bounds fall on its period boundaries.
+
+    Parameters
+    ----------
+    every : str
+        Requested period as a polars duration, e.g. '15m', '1h', '1d', '1w', '1mo'.
+    start, end : datetime, optional
+        Query bounds [start, end).
+
+    Returns
+    -------
+    str
+        'month', 'day', 'hour' or 'minute'.
+    """
+
+    match = EVERY_PATTERN.match(every)
+    if match is None:
+        raise ValueError(f"Unsupported period: {every}")
+    unit = match.group(2)
+    for resolution, _, units in RESOLUTIONS:
+        if unit in units and is_aligned(start, resolution) and is_aligned(end, resolution):
+            return resolution
+    raise ValueError(f"No rollup answers period {every} with bounds {start} - {end}; use the raw sensor data")
+
+
+def query_sensor_rollup(
+    rollup_root: Path,
+    every: str,
+    start: datetime = None,
+    end: datetime = None,
+    home_id: int = None,
+    sensor_category: str = None,
+    sensor_name: str = None,
+) -> pl.LazyFrame:
+    """
+    Aggregate electric sensor data per sensor and period from the coarsest usable rollup.
+
+    Parameters
+    ----------
+    rollup_root : Path
+        Root of the rollup dataset (`resolution=<r>/home_id=<id>/sensor_category=<c>/year_month=<YYYY-MM>/`).
+    every : str
+        Requested period as a polars duration, e.g. '1h', '1d', '1mo'.
+    start, end : datetime, optional
+        Query bounds [start, end).
+    home_id, sensor_category, sensor_name : optional
+        Filters; the first two prune partitions.
+
+    Returns
+    -------
+    pl.LazyFrame
+        One row per sensor and period with the columns:
+        - 'home_id', 'sensor_category', 'sensor_id', 'sensor_name', 'room'
+        - 'period_start' : start of the period (type: Datetime)
+        - 'energy_kWh' : energy used in the period
+        - 'mean_W', 'max_W' : mean and maximum power of the readings
+        - 'samples' : number of readings
+        - 'gaps' : number of gaps in the readings starting in the period
+    """
+
+    resolution = choose_rollup_resolution(every, start, end)
+    df = pl.scan_parquet(
+        Path(rollup_root) / f"resolution={resolution}" / "**" / "*.parquet",
+        hive_partitioning=True,
+        hive_schema=ROLLUP_HIVE_SCHEMA,
+    )
+
+    filters = []
+    if home_id is not None:
+        filters.append(pl.col("home_id") == home_id)
+    if sensor_category is not None:
+        filters.append(pl.col("sensor_category") == sensor_category)
+    if sensor_name is not None:
+        filters.append(pl.col("sensor_name") == sensor_name)
+    if start is not None:
+        filters += [pl.col("year_month") >= f"{start:%Y-%m}", pl.col("period_start") >= start]
+    if end is not None:
+        filters += [pl.col("year_month") <= f"{end:%Y-%m}", pl.col("period_start") < end]
+    if filters:
+        df = df.filter(pl.all_horizontal(filters))
+
+    group_cols = ["home_id", "sensor_category"] + SENSOR_COLS
+    return (
+        df.sort(group_cols + ["period_start"])
+        .group_by_dynamic("period_start", every=every, group_by=group_cols)
+        .agg(rollup_aggregations())
+    )
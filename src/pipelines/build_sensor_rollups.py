@@ -0,0 +1,212 @@
+import sys
+import os
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data_processing.integrate_power import with_interval_energy
+from src.data_processing.query_sensor_rollup import RESOLUTIONS, SENSOR_COLS, rollup_aggregations
+from src.pipelines.consolidate_sensor_dataset import DATASET_NAME, target_dir
+from src.pipelines.transform_to_parquet_parallel import run_in_pool, max_workers
+
+ROLLUP_DIR_NAME = "electric_rollups"
+MANIFEST_NAME = "rollup_manifest.json"
+# Wersja 2: rollupy całkują ostatni odczyt miesiąca do pierwszego odczytu następnej partycji
+MANIFEST_FORMAT_VERSION = 2
+ROW_GROUP_SIZE = 262_144
+
+
+def load_manifest(output_dir: Path) -> dict:
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        return {}
+    return manifest["partitions"]
+
+
+def save_manifest(output_dir: Path, manifest: dict) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format_version": MANIFEST_FORMAT_VERSION, "partitions": manifest}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+
+
+def partition_signature(partition_dir: Path) -> str:
+    return ";".join(
+        f"{path.name}:{path.stat().st_size}:{path.stat().st_mtime_ns}" for path in sorted(partition_dir.glob("*.parquet"))
+    )
+
+
+def first_readings(partition_dir: Path) -> dict:
+    """
+    Function to read the first reading time of every sensor in one month partition.
+    Returns:
+        dict: Mapping of sensor_id to the ISO timestamp of its first reading.
+    """
+
+    first = (
+        pl.scan_parquet(partition_dir / "*.parquet")
+        .group_by(pl.col("sensor_id").cast(pl.String))
+        .agg(pl.col("timestamp").min())
+        .collect(engine="streaming")
+    )
+    return {sensor_id: timestamp.isoformat() for sensor_id, timestamp in sorted(first.iter_rows())}
+
+
+def minute_rollup(partition_dir: Path, next_readings: dict = None) -> pl.DataFrame:
+    """
+    Function to compute the minute rollup of one month partition of the sensor dataset.
+    The raw readings are read once; coarser rollups are derived from this result.
+    The last reading of every sensor is held until the sensor's first reading in the next
+    partition, so month totals add up to the totals of the whole series.
+    Args:
+        partition_dir (Path): `home_id=<id>/sensor_category=<category>/year_month=<YYYY-MM>/` directory.
+        next_readings (dict): First reading per sensor_id in the next partition (see `first_readings`);
+            sensors without one hold their last reading for NOMINAL_SAMPLE_INTERVAL_S.
+    """
+
+    readings = pl.scan_parquet(partition_dir / "*.parquet").with_columns(
+        [pl.col(c).cast(pl.String) for c in SENSOR_COLS]
+    )
+    boundary = None
+    if next_readings:
+        boundary = pl.LazyFrame(
+            {
+                "sensor_id": list(next_readings),
+                "next_timestamp": [datetime.fromisoformat(t) for t in next_readings.values()],
+            },
+            schema={"sensor_id": pl.String, "next_timestamp": pl.Datetime("us")},
+        )
+    return (
+        with_interval_energy(readings, by=["sensor_id"], next_readings=boundary)
+        .group_by(SENSOR_COLS + [pl.col("timestamp").dt.truncate("1m").alias("period_start")])
+        .agg(
+            pl.col("energy_kWh").sum(),
+            pl.col("value").mean().alias("mean_W"),
+            pl.col("value").max().alias("max_W"),
+            pl.len().cast(pl.Int64).alias("samples"),
+            pl.col("is_gap").sum().cast(pl.Int64).alias("gaps"),
+        )
+        .sort(SENSOR_COLS + ["period_start"])
+        .collect(engine="streaming")
+    )
+
+
+def rollup_partition(partition_dir: Path, relative_dir: str, rollup_root: Path, next_dir: Path = None) -> tuple:
+    """
+    Worker: writes the minute, hour, day and month rollups of one partition to
+    `<rollup_root>/resolution=<r>/<relative_dir>/part-0.parquet`, each file replaced atomically.
+    `next_dir` is the next month partition of the same unit, whose first readings end this month's series.
+    Returns:
+        tuple: (status, first readings of `next_dir` used for the boundary, or error message).
+    """
+
+    try:
+        next_readings = first_readings(next_dir) if next_dir is not None else None
+        rollup = minute_rollup(partition_dir, next_readings)
+        for resolution, every, _ in reversed(RESOLUTIONS):
+            if resolution != "minute":
+                rollup = (
+                    rollup.group_by(SENSOR_COLS + [pl.col("period_start").dt.truncate(every)])
+                    .agg(rollup_aggregations())
+                    .sort(SENSOR_COLS + ["period_start"])
+                )
+            target = rollup_root / f"resolution={resolution}" / relative_dir / "part-0.parquet"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_target = target.with_suffix(".parquet.tmp")
+            rollup.with_columns([pl.col(c).cast(pl.Categorical) for c in SENSOR_COLS]).write_parquet(
+                tmp_target, compression="zstd", row_group_size=ROW_GROUP_SIZE
+            )
+            os.replace(tmp_target, target)
+        return "ok", next_readings
+    except Exception as e:
+        return "error", str(e)
+
+
+def remove_partition(rollup_root: Path, relative_dir: str) -> None:
+    for resolution, _, _ in RESOLUTIONS:
+        shutil.rmtree(rollup_root / f"resolution={resolution}" / relative_dir, ignore_errors=True)
+
+
+def build_rollups(dataset: Path = target_dir / DATASET_NAME, rollup_root: Path = target_dir / ROLLUP_DIR_NAME,
+                  workers: int = max_workers) -> Path:
+    """
+    Function to build or update the rollup dataset of the consolidated sensor dataset.
+    Rollups follow the month partitions of the sensor dataset, so only partitions that changed
+    since the last run (new data landed) are recomputed, and rollups of removed partitions are deleted.
+    A month is also recomputed when the first readings of the next month partition change, since
+    its last readings are integrated up to them.
+    Args:
+        dataset (Path): The consolidated sensor dataset.
+        rollup_root (Path): Root of the rollup dataset, read with `query_sensor_rollup`.
+        workers (int): Number of worker processes.
+    """
+
+    partitions = {
+        str(path.relative_to(dataset)): path
+        for path in sorted(dataset.glob("home_id=*/sensor_category=*/year_month=*"))
+    }
+    manifest = load_manifest(rollup_root)
+    signatures = {relative_dir: partition_signature(path) for relative_dir, path in partitions.items()}
+    # Następna partycja miesięczna tej samej jednostki; jej pierwsze odczyty kończą bieżący miesiąc
+    relative_dirs = list(partitions)
+    next_partition = {
+        relative_dir: next_dir
+        for relative_dir, next_dir in zip(relative_dirs, relative_dirs[1:])
+        if Path(relative_dir).parent == Path(next_dir).parent
+    }
+
+    for relative_dir in set(manifest) - set(partitions):
+        remove_partition(rollup_root, relative_dir)
+        del manifest[relative_dir]
+
+    tasks = {}
+    for relative_dir, path in partitions.items():
+        entry = manifest.get(relative_dir)
+        next_dir = next_partition.get(relative_dir)
+        next_signature = signatures[next_dir] if next_dir else None
+        task = (path, relative_dir, rollup_root, partitions[next_dir] if next_dir else None)
+        if entry is None or entry["signature"] != signatures[relative_dir]:
+            tasks[relative_dir] = task
+        elif (entry["next"], entry["next_signature"]) != (next_dir, next_signature):
+            # the next partition changed: only its first readings matter for this month
+            next_readings = first_readings(partitions[next_dir]) if next_dir else None
+            if next_readings != entry["next_readings"]:
+                tasks[relative_dir] = task
+            else:
+                entry.update(next=next_dir, next_signature=next_signature)
+
+    print(f"Znaleziono {len(partitions)} partycji, do przeliczenia: {len(tasks)}.")
+    try:
+        for relative_dir, (status, result) in run_in_pool(rollup_partition, tasks, workers):
+            if status == "error":
+                print(f"❌ Błąd: {relative_dir} -> {result}")
+                continue
+            next_dir = next_partition.get(relative_dir)
+            manifest[relative_dir] = {
+                "signature": signatures[relative_dir],
+                "next": next_dir,
+                "next_signature": signatures[next_dir] if next_dir else None,
+                "next_readings": result,
+            }
+    finally:
+        save_manifest(rollup_root, manifest)
+    return rollup_root
+
+
+def main():
+    rollup_root = build_rollups()
+    print(f"Zapisano agregaty: {rollup_root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import sys
+import os
+import re
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.pipelines.transform_to_parquet_parallel import run_in_pool, max_workers
+
+source_dir = Path("Data/Parquet")
+target_dir = Path("Data/SENSORS")
+DATASET_NAME = "electric_sensors"
+MANIFEST_NAME = "consolidate_manifest.json"
+# Wersja 2: odciski miesięcy każdego pliku, przepisywane są tylko zmienione miesiące
+MANIFEST_FORMAT_VERSION = 2
+STAGING_DIR_NAME = ".staging"
+
+PARTITION_COLS = ["home_id", "sensor_category", "year_month"]
+HIVE_SCHEMA = {"home_id": pl.Int32, "sensor_category": pl.String, "year_month": pl.String}
+# Kolumny zapisywane w plikach; partycje są tylko w ścieżkach katalogów
+SENSOR_DATASET_SCHEMA = pa.schema([
+    ("sensor_id", pa.dictionary(pa.int32(), pa.string())),
+    ("sensor_name", pa.dictionary(pa.int32(), pa.string())),
+    ("room", pa.dictionary(pa.int32(), pa.string())),
+    ("timestamp", pa.timestamp("us")),
+    ("value", pa.int32()),
+])
+# ~3 dni odczytów 1 Hz na grupę wierszy
+ROW_GROUP_SIZE = 262_144
+
+# e.g. home105_kitchen1110_sensor5283_electric-appliance_kettle, home126_hall1183_sensor5718c5722_electric-mains_electric-combined
+SENSOR_FILENAME = re.compile(
+    r"^home(?P<home_id>\d+)_(?P<room>[a-z]+\d+)_sensor(?P<sensor_id>[\dc]+)_(?P<sensor_category>electric-[a-z]+)_(?P<sensor_name>.+)$"
+)
+
+
+def parse_sensor_filename(path: Path) -> dict:
+    """
+    Function to read the sensor metadata encoded in an IDEAL sensor file name.
+    Args:
+        path (Path): Path to a `home<id>_<room><id>_sensor<id>_electric-<category>_<name>.parquet` file.
+    Returns:
+        dict: home_id, room, sensor_id, sensor_category and sensor_name, or None for other files.
+    """
+
+    match = SENSOR_FILENAME.match(path.name.removesuffix(".parquet"))
+    if match is None:
+        return None
+    sensor = match.groupdict()
+    sensor["home_id"] = int(sensor["home_id"])
+    return sensor
+
+
+def discover_units(folder: Path) -> dict:
+    """
+    Function to group the electric sensor files by (home_id, sensor_category), the unit rewritten at once.
+    Args:
+        folder (Path): Folder with the per-sensor Parquet files written by the ingest.
+    """
+
+    units = {}
+    for path in sorted(folder.rglob("*.parquet")):
+        if path.name.startswith("._"):
+            continue
+        sensor = parse_sensor_filename(path)
+        if sensor is not None:
+            units.setdefault((sensor["home_id"], sensor["sensor_category"]), []).append(path)
+    return units
+
+
+def unit_signature(paths: list) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict:
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        return {}
+    return manifest["units"]
+
+
+def save_manifest(output_dir: Path, manifest: dict) -> None:
+    tmp_path = output_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format_version": MANIFEST_FORMAT_VERSION, "units": manifest}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+
+
+def scan_unit(paths: list) -> pl.LazyFrame:
+    """
+    Function to lazily scan the sensor files of one unit, tagging every reading with its sensor.
+    """
+
+    frames = []
+    for path in paths:
+        sensor = parse_sensor_filename(path)
+        frames.append(
+            pl.scan_parquet(path).select(
+                pl.lit(sensor["sensor_id"]).alias("sensor_id"),
+                pl.lit(sensor["sensor_name"]).alias("sensor_name"),
+                pl.lit(sensor["room"]).alias("room"),
+                pl.col("timestamp").cast(pl.Datetime("us")),
+                pl.col("value").cast(pl.Int32),
+            )
+        )
+    return pl.concat(frames)
+
+
+def month_digests(path: Path) -> dict:
+    """
+    Function to fingerprint the readings of one sensor file month by month, so a changed file
+    only marks the months whose readings changed (an append to February leaves January alone).
+    The digest is the row count and an order-independent sum of row hashes; polars hashes are
+    not stable across polars versions, so an upgrade at worst rewrites every month once.
+    Args:
+        path (Path): Sensor file.
+    Returns:
+        dict: Mapping of 'YYYY-MM' to the digest of that month's readings.
+    """
+
+    digests = (
+        pl.scan_parquet(path)
+        .select(pl.col("timestamp").cast(pl.Datetime("us")), pl.col("value").cast(pl.Int32))
+        .group_by(pl.col("timestamp").dt.strftime("%Y-%m").alias("year_month"))
+        .agg(pl.len().alias("rows"), pl.struct("timestamp", "value").hash(seed=0).sum().alias("hash"))
+        .collect(engine="streaming")
+    )
+    return {row["year_month"]: f"{row['rows']}:{row['hash']}" for row in digests.iter_rows(named=True)}
+
+
+def month_signatures(files: dict) -> dict:
+    """
+    Combine the per-file month digests of a unit into one signature per month.
+    """
+
+    months = {}
+    for name in sorted(files):
+        for month, digest in files[name]["months"].items():
+            months.setdefault(month, []).append(f"{name}={digest}")
+    return {month: ";".join(parts) for month, parts in months.items()}
+
+
+def next_month(start: datetime) -> datetime:
+    return datetime(start.year + 1, 1, 1) if start.month == 12 else datetime(start.year, start.month + 1, 1)
+
+
+def write_month(paths: list, month: str, unit: Path, dataset: Path, staging: Path) -> int:
+    """
+    Function to rewrite one `year_month=<YYYY-MM>/part-0.parquet` partition of a unit.
+    The rows are sorted by sensor and timestamp, so every row group covers a single sensor and
+    a short time range, and its statistics let readers skip it. The partition is written to a
+    staging directory outside the dataset and swapped in when complete, so readers never see a
+    half-written month.
+    Args:
+        paths (list): Sensor files of the unit with readings in this month.
+        month (str): 'YYYY-MM'.
+        unit (Path): `home_id=<id>/sensor_category=<category>` relative to the dataset.
+        dataset (Path): The dataset directory.
+        staging (Path): Staging directory.
+    Returns:
+        int: Number of rows written.
+    """
+
+    start = datetime.strptime(month, "%Y-%m")
+    df = (
+        scan_unit(paths)
+        .filter((pl.col("timestamp") >= start) & (pl.col("timestamp") < next_month(start)))
+        .sort(["sensor_name", "sensor_id", "timestamp"])
+        .collect()
+    )
+    month_dir = staging / unit / f"year_month={month}"
+    if month_dir.exists():
+        shutil.rmtree(month_dir)
+    month_dir.mkdir(parents=True)
+    pq.write_table(
+        df.to_arrow().cast(SENSOR_DATASET_SCHEMA),
+        month_dir / "part-0.parquet",
+        row_group_size=ROW_GROUP_SIZE,
+        compression="zstd",
+    )
+
+    target = dataset / unit / f"year_month={month}"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    old_target = staging / unit / f"year_month={month}.old"
+    if target.exists():
+        os.replace(target, old_target)
+    os.replace(month_dir, target)
+    if old_target.exists():
+        shutil.rmtree(old_target)
+    return df.height
+
+
+def consolidate_unit(home_id: int, sensor_category: str, paths: list, previous: dict, dataset: Path,
+                     staging: Path) -> tuple:
+    """
+    Worker: brings `home_id=<id>/sensor_category=<category>/` up to date with its sensor files.
+    Files whose size and mtime match the manifest reuse their month digests; the others are
+    fingerprinted again. Only the months whose signature changed are rewritten, and months
+    without readings are removed, so unchanged month files (and their mtimes) are left alone.
+    Returns:
+        tuple: (status, (manifest entry, months rewritten, rows written) or error message).
+    """
+
+    try:
+        unit = Path(f"home_id={home_id}") / f"sensor_category={sensor_category}"
+        unit_dir = dataset / unit
+        previous_files = previous.get("files", {})
+
+        files = {}
+        for path in paths:
+            stat = path.stat()
+            entry = previous_files.get(path.name)
+            if entry is None or (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "months": month_digests(path)}
+            files[path.name] = entry
+
+        old_months = month_signatures(previous_files)
+        new_months = month_signatures(files)
+        changed = sorted(
+            month for month, signature in new_months.items()
+            if signature != old_months.get(month) or not (unit_dir / f"year_month={month}").exists()
+        )
+
+        rows = 0
+        for month in changed:
+            month_paths = [path for path in paths if month in files[path.name]["months"]]
+            rows += write_month(month_paths, month, unit, dataset, staging)
+        for month_dir in unit_dir.glob("year_month=*"):
+            if month_dir.name.removeprefix("year_month=") not in new_months:
+                shutil.rmtree(month_dir)
+
+        return "ok", ({"signature": unit_signature(paths), "files": files}, len(changed), rows)
+    except Exception as e:
+        return "error", str(e)
+
+
+def consolidate(source_root: Path = source_dir, target_root: Path = target_dir, workers: int = max_workers) -> Path:
+    """
+    Function to build (or update) the hive-partitioned sensor dataset
+    `<target_root>/electric_sensors/home_id=<id>/sensor_category=<category>/year_month=<YYYY-MM>/`.
+    Only units whose sensor files changed since the last run are checked, and only the months
+    whose readings changed are rewritten; units whose files disappeared are removed.
+    Args:
+        source_root (Path): Folder with the per-sensor Parquet files.
+        target_root (Path): Folder of the dataset and its manifest.
+        workers (int): Number of worker processes.
+    Returns:
+        Path: The dataset directory.
+    """
+
+    dataset = target_root / DATASET_NAME
+    staging = target_root / STAGING_DIR_NAME
+    dataset.mkdir(parents=True, exist_ok=True)
+
+    units = discover_units(source_root)
+    manifest = load_manifest(target_root)
+    signatures = {f"{home_id}/{category}": unit_signature(paths) for (home_id, category), paths in units.items()}
+
+    for key in set(manifest) - set(signatures):
+        home_id, category = key.split("/")
+        home_dir = dataset / f"home_id={home_id}"
+        shutil.rmtree(home_dir / f"sensor_category={category}", ignore_errors=True)
+        if home_dir.exists() and not any(home_dir.iterdir()):
+            home_dir.rmdir()
+        del manifest[key]
+
+    tasks = {
+        (home_id, category): (home_id, category, paths, manifest.get(f"{home_id}/{category}", {}), dataset, staging)
+        for (home_id, category), paths in units.items()
+        if manifest.get(f"{home_id}/{category}", {}).get("signature") != signatures[f"{home_id}/{category}"]
+    }
+    print(f"Znaleziono {len(units)} zestawów czujników, do sprawdzenia: {len(tasks)}.")
+    try:
+        for (home_id, category), (status, result) in run_in_pool(consolidate_unit, tasks, workers):
+            if status == "error":
+                print(f"❌ Błąd: home{home_id} {category} -> {result}")
+                continue
+            entry, months, rows = result
+            manifest[f"{home_id}/{category}"] = entry
+            print(f"✔️ home{home_id} {category}: przepisano {months} miesięcy ({rows} odczytów)")
+    finally:
+        save_manifest(target_root, manifest)
+        shutil.rmtree(staging, ignore_errors=True)
+    return dataset
+
+
+def scan_sensor_dataset(dataset: Path = target_dir / DATASET_NAME) -> pl.LazyFrame:
+    """
+    Function to lazily scan the consolidated sensor dataset.
+    Filters on the partition columns prune directories, and filters on sensor_name or timestamp
+    skip row groups, e.g. all shower subcircuits in January 2017:
+
+        scan_sensor_dataset().filter(
+            (pl.col("sensor_category") == "electric-subcircuit")
+            & (pl.col("year_month") == "2017-01")
+            & (pl.col("sensor_name") == "shower")
+        )
+    Args:
+        dataset (Path): The dataset directory.
+    """
+
+    return pl.scan_parquet(
+        dataset / "**" / "*.parquet", hive_partitioning=True, hive_schema=HIVE_SCHEMA
+    )
+
+
+def main():
+    dataset = consolidate()
+    print(f"Zapisano dataset: {dataset}")
+
+
+if __name__ == "__main__":
+    main()
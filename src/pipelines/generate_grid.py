@@ -1,77 +1,157 @@
 import sys
 import os
+import json
+import shutil
+import hashlib
 from pathlib import Path
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 sys.path.append(os.path.abspath(os.path.join("../../")))
 
 from src.comparisons.household import Kitchen, Bathroom, Room
-from src.comparisons.grid import compute_all_combinations_parallel
+from src.comparisons.grid import iter_grid_batches
+
+STEP = 0.1
+BLOCK_SIZE = 65536
+# "numba" uses the compiled parallel kernel; both backends produce identical grids
+BACKEND = "numpy"
+# "float32" weights or "int8" step indices (decoded by src.comparisons.grid.read_grid_parquet)
+WEIGHT_FORMAT = "float32"
+MANIFEST_NAME = "grid_manifest.json"
+PARTIAL_DIR_NAME = ".partial"
+
+
+def grid_cache_key(df: pd.DataFrame, features: list, step: float) -> str:
+    """
+    Content address of a category grid.
+
+    The key changes whenever the device summary table, the feature list, the step,
+    the block layout or the weight storage format changes, and only then.
+    Args:
+        df (pd.DataFrame): Device summary table of the category.
+        features (list): Feature columns that receive weights.
+        step (float): Step size of the weight grid.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "columns": [str(c) for c in df.columns],
+        "features": list(features),
+        "step": step,
+        "block_size": BLOCK_SIZE,
+        "weight_format": WEIGHT_FORMAT,
+    }).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict:
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir: Path, manifest: dict) -> None:
+    tmp_path = output_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+
+
+def generate_category_grid(name: str, df: pd.DataFrame, features: list, output_dir: Path, manifest: dict) -> bool:
+    """
+    Generate `<name>_grid.parquet` unless an up-to-date grid already exists.
+
+    Every block of the grid is first checkpointed as its own Parquet file in
+    `.partial/<name>-<key>/`, so an interrupted run resumes from the last finished block.
+    When all blocks are done they are copied as row groups into the final file.
+    Args:
+        name (str): Category name.
+        df (pd.DataFrame): Device summary table of the category.
+        features (list): Feature columns that receive weights.
+        output_dir (Path): Folder with the grid files.
+        manifest (dict): Mapping of category name to the key of its current grid, updated in place.
+    Returns:
+        bool: True if the grid was (re)generated, False if it was already up to date.
+    """
+
+    key = grid_cache_key(df, features, STEP)
+    target = output_dir / f"{name}_grid.parquet"
+    if manifest.get(name) == key and target.exists():
+        return False
+
+    partial_root = output_dir / PARTIAL_DIR_NAME
+    partial_dir = partial_root / f"{name}-{key[:16]}"
+    for stale in partial_root.glob(f"{name}-*"):
+        if stale != partial_dir:
+            shutil.rmtree(stale)
+    partial_dir.mkdir(parents=True, exist_ok=True)
+
+    done = len(list(partial_dir.glob("part-*.parquet")))
+    if done:
+        print(f"Wznawiam {name} od bloku {done}")
+    batches = iter_grid_batches(
+        df, features, STEP, BLOCK_SIZE, start_block=done, backend=BACKEND, weight_format=WEIGHT_FORMAT
+    )
+    for i, batch in enumerate(batches, start=done):
+        tmp_path = partial_dir / f"part-{i:05d}.parquet.tmp"
+        pq.write_table(pa.Table.from_batches([batch]), tmp_path)
+        os.replace(tmp_path, partial_dir / f"part-{i:05d}.parquet")
+
+    tmp_target = target.with_suffix(".parquet.tmp")
+    parts = sorted(partial_dir.glob("part-*.parquet"))
+    with pq.ParquetWriter(tmp_target, pq.read_schema(parts[0])) as writer:
+        for part in parts:
+            writer.write_table(pq.read_table(part))
+    os.replace(tmp_target, target)
+
+    manifest[name] = key
+    save_manifest(output_dir, manifest)
+    shutil.rmtree(partial_dir)
+    return True
+
+
+BASE_FEATURES = ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"]
+
+
+def category_datasets() -> dict:
+    """
+    Device summary tables of every comparison category with the features that receive weights.
+    Shared by the grid generator and `src.comparisons.decision_regions.build_decision_indices`.
+    Returns:
+        dict: Mapping of category name to a tuple (device summary DataFrame, list of features).
+    """
+
+    return {
+        "cooking": (Kitchen.compare_cooking_devices(time_minutes=30), BASE_FEATURES),
+        "heating": (Kitchen.compare_heating_devices(time_minutes=30), BASE_FEATURES + ["heating_quality"]),
+        "coffee": (Kitchen.compare_coffee_devices(cups=1), BASE_FEATURES),
+        "robots": (Kitchen.compare_multicookers(recipe_complexity=1.5), BASE_FEATURES + ["cooking_quality"]),
+        "heaters": (Bathroom.compare_water_heaters(liters=50), BASE_FEATURES),
+        "bath": (Bathroom.compare_bathing_options(), BASE_FEATURES),
+        "air_heating": (Bathroom.compare_bathroom_heating(), BASE_FEATURES + ["heating_quality"]),
+        "work": (Room.compare_workstations(), BASE_FEATURES + ["computing_quality"]),
+        "cooling": (Room.compare_cooling_devices(duration_min=60), BASE_FEATURES + ["cooling_quality"]),
+    }
+
 
 def main():
     output_dir = Path("../../Data/GRID")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    df_cooking = Kitchen.compare_cooking_devices(time_minutes=30)
-    df_heating = Kitchen.compare_heating_devices(time_minutes=30)
-    df_coffee = Kitchen.compare_coffee_devices(cups=1)
-    df_robots = Kitchen.compare_multicookers(recipe_complexity=1.5)
-    df_heaters = Bathroom.compare_water_heaters(liters=50)
-    df_bath = Bathroom.compare_bathing_options()
-    df_air_heating = Bathroom.compare_bathroom_heating()
-    df_work = Room.compare_workstations()
-    df_cooling = Room.compare_cooling_devices(duration_min=60)
-
-    locals_dfs = {
-        "df_cooking": df_cooking,
-        "df_heating": df_heating,
-        "df_coffee": df_coffee,
-        "df_robots": df_robots,
-        "df_heaters": df_heaters,
-        "df_bath": df_bath,
-        "df_air_heating": df_air_heating,
-        "df_work": df_work,
-        "df_cooling": df_cooling
-    }
-
-    datasets = [
-        ("cooking", "df_cooking", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"
-        ]),
-        ("heating", "df_heating", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "heating_quality"
-        ]),
-        ("coffee", "df_coffee", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"
-        ]),
-        ("robots", "df_robots", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "cooking_quality"
-        ]),
-        ("heaters", "df_heaters", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"
-        ]),
-        ("bath", "df_bath", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"
-        ]),
-        ("air_heating", "df_air_heating", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "heating_quality"
-        ]),
-        ("work", "df_work", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "computing_quality"
-        ]),
-        ("cooling", "df_cooling", [
-            "cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "cooling_quality"
-        ]),
-    ]
-
-    for name, df_varname, features in datasets:
+    manifest = load_manifest(output_dir)
+    for name, (df, features) in category_datasets().items():
         try:
-            df = locals_dfs[df_varname]
             print(f" Generowanie siatki wag dla: {name}...")
-            results = compute_all_combinations_parallel(df, features, step=0.1, n_jobs=-1)
-            results.to_parquet(output_dir / f"{name}_grid.parquet", index=False)
-            print(f"Zapisano: {name}_grid.parquet")
-        except KeyError:
-            print(f"{df_varname} nie istnieje. Pomijam.")
+            if generate_category_grid(name, df, features, output_dir, manifest):
+                print(f"Zapisano: {name}_grid.parquet")
+            else:
+                print(f"{name}_grid.parquet jest aktualny. Pomijam.")
         except Exception as e:
             print(f"Błąd dla {name}: {e}")
 
@@ -0,0 +1,38 @@
+import sys
+import os
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join("../../")))
+
+from src.comparisons.sweep import build_sweep_cube, write_sweep_cube
+
+SCENARIOS = {
+    "boiling_water": {"liters": np.arange(0.5, 3.01, 0.25)},
+    "cooking": {"time_minutes": np.arange(10, 121, 10)},
+    "heating_food": {"time_minutes": np.arange(5, 61, 5)},
+    "making_coffee": {"cups": np.arange(1, 7)},
+    "multicookers": {"recipe_complexity": np.arange(0.5, 2.51, 0.25)},
+    "water_heating": {"liters": np.arange(20, 201, 10)},
+    "bathing": {},
+    "bathroom_heating": {},
+    "workstation": {},
+    "cooling": {"duration_min": np.arange(15, 481, 15)},
+}
+PRICE_PER_KWH = np.round(np.arange(0.40, 1.501, 0.05), 2)     # PLN/kWh
+EMISSION_FACTOR = np.round(np.arange(0.10, 0.901, 0.05), 2)   # kg CO2/kWh
+
+
+def main():
+    output_dir = Path("../../Data/SWEEP")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print("Obliczanie kostki scenariuszy...")
+    cube = build_sweep_cube(SCENARIOS, price_per_kwh=PRICE_PER_KWH, emission_factor=EMISSION_FACTOR)
+    write_sweep_cube(cube, output_dir / "sweep_cube")
+    print(f"Zapisano {len(cube)} wierszy do: {output_dir / 'sweep_cube'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,223 @@
 from pathlib import Path
 import polars as pl
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import hashlib
+import json
 import os
+import sys
 
 # Ustawienia
 source_dir = Path("Data/CSV")
 target_dir = Path("Data/Parquet")
-max_workers = min(6, os.cpu_count() or 4)  # M1: 6 wątków to bezpieczny kompromis
+max_workers = os.cpu_count() or 4
+MANIFEST_NAME = "ingest_manifest.json"
+# Wersja 2: pliki czytane bez nagłówka (wcześniejsze konwersje traciły pierwszy wiersz)
+MANIFEST_FORMAT_VERSION = 2
+
+# Pliki IDEAL nie mają nagłówka: "YYYY-MM-DD HH:MM:SS,<W>"
+SENSOR_SCHEMA = {"timestamp": pl.Datetime("us"), "value": pl.Int32}
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 3
+# ~12 dni odczytów 1 Hz na grupę wierszy
+ROW_GROUP_SIZE = 1_048_576
+
 
 def remove_csv_extensions(path: Path) -> Path:
     if path.suffix == ".gz" and path.stem.endswith(".csv"):
         return path.with_suffix('').with_suffix('')
     return path.with_suffix('')
 
-def convert_csv_to_parquet(source_file: Path):
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict:
+    """
+    Returns:
+        dict: Mapping of source path to its manifest entry. A manifest written by another
+        format version is ignored, so every file is converted again with the current reader.
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        print(f"Manifest w wersji {manifest.get('format_version')}, konwertuję wszystkie pliki od nowa.")
+        return {}
+    return manifest["files"]
+
+
+def save_manifest(output_dir: Path, manifest: dict) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format_version": MANIFEST_FORMAT_VERSION, "files": manifest}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+
+
+def target_path(source_file: Path, source_root: Path = source_dir, target_root: Path = target_dir) -> Path:
+    relative_path = source_file.relative_to(source_root)
+    return target_root / remove_csv_extensions(relative_path).with_suffix(".parquet")
+
+
+def is_unchanged(source_file: Path, entry: dict) -> bool:
+    """
+    Cheap check (a single `stat`): the file has the size and mtime recorded in the manifest
+    and its Parquet file still exists.
+    """
+    if not entry:
+        return False
+    stat = source_file.stat()
+    if (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+        return False
+    return entry["target"] is None or Path(entry["target"]).exists()
+
+
+def sink_csv_to_parquet(source_file: Path, target_file: Path) -> int:
+    """
+    Streams one headerless sensor CSV (plain or .gz) into Parquet with the fixed schema.
+
+    The file is never fully materialized; it is written to a temporary file that replaces
+    the target only when complete, so an interrupted run never leaves a truncated Parquet file.
+    A source without readings (e.g. a .csv.gz of empty content, which is not empty on disk)
+    writes nothing, and a Parquet file left from its earlier content is removed.
+
+    Returns:
+        int: Number of readings written.
+    """
+    target_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = target_file.with_suffix(".parquet.tmp")
+    (
+        pl.scan_csv(source_file, has_header=False, schema=SENSOR_SCHEMA)
+        .sink_parquet(
+            tmp_file,
+            compression=COMPRESSION,
+            compression_level=COMPRESSION_LEVEL,
+            row_group_size=ROW_GROUP_SIZE,
+        )
+    )
+    # Liczba wierszy ze stopki Parqueta, bez czytania danych
+    n_rows = pl.scan_parquet(tmp_file).select(pl.len()).collect().item()
+    if n_rows == 0:
+        tmp_file.unlink()
+        target_file.unlink(missing_ok=True)
+        return 0
+    os.replace(tmp_file, target_file)
+    return n_rows
+
+
+def convert_csv_to_parquet(source_file: Path, target_file: Path, entry: dict) -> tuple:
+    """
+    Converts one file in a worker process.
+
+    Args:
+        source_file (Path): CSV file.
+        target_file (Path): Parquet file to write.
+        entry (dict): Previous manifest entry of the file, or None.
+
+    Returns:
+        tuple: (status, manifest entry), status is "converted", "unchanged", "empty" or "error".
+    """
     try:
-        df = pl.read_csv(source_file)
-        if df.is_empty():
-            print(f"Pusty plik: {source_file}, pomijam.")
-            return
-        relative_path = source_file.relative_to(source_dir)
-        base_path = remove_csv_extensions(relative_path)
-        target_file = target_dir / base_path.with_suffix(".parquet")
-        target_file.parent.mkdir(parents=True, exist_ok=True)
-        df.write_parquet(target_file)
-        print(f"✔️ Zapisano: {target_file}")
+        stat = source_file.stat()
+        new_entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(source_file),
+            "target": str(target_file),
+        }
+        # Touched but identical content (e.g. re-extracted archive): only the manifest entry is refreshed
+        if entry and entry["sha256"] == new_entry["sha256"] and target_file.exists():
+            return "unchanged", new_entry
+        if sink_csv_to_parquet(source_file, target_file) == 0:
+            new_entry["target"] = None
+            return "empty", new_entry
+        return "converted", new_entry
     except Exception as e:
-        print(f"❌ Błąd: {source_file} -> {e}")
+        return "error", str(e)
 
-def main():
+
+def repair_header_parquet(path: Path) -> bool:
+    """
+    Repairs, in place, a Parquet file converted by the old readers, which read the headerless
+    CSV with a header: the first reading became the column names and the timestamp stayed a string.
+
+    The lost row is restored from the column names, the columns are renamed and typed with
+    SENSOR_SCHEMA, and the result is streamed to a temporary file that atomically replaces the
+    original. Files that already have the expected columns are left untouched.
+
+    Returns:
+        bool: True if the file was repaired.
+    """
+    schema = pl.read_parquet_schema(path)
+    names = list(schema)
+    if names == list(SENSOR_SCHEMA):
+        return False
+
+    timestamp = pl.col("timestamp")
+    if schema[names[0]] == pl.String:
+        timestamp = timestamp.str.strptime(pl.Datetime("us"), format="%Y-%m-%d %H:%M:%S")
+    first_row = pl.LazyFrame(
+        {"timestamp": [names[0]], "value": [int(names[1])]}
+    ).with_columns(
+        pl.col("timestamp").str.strptime(pl.Datetime("us"), format="%Y-%m-%d %H:%M:%S"),
+        pl.col("value").cast(pl.Int32),
+    )
+    readings = (
+        pl.scan_parquet(path)
+        .select(pl.nth(0).alias("timestamp"), pl.nth(1).alias("value"))
+        .with_columns(timestamp.cast(pl.Datetime("us")), pl.col("value").cast(pl.Int32))
+    )
+    tmp_file = path.with_suffix(".parquet.tmp")
+    pl.concat([first_row, readings]).sink_parquet(
+        tmp_file,
+        compression=COMPRESSION,
+        compression_level=COMPRESSION_LEVEL,
+        row_group_size=ROW_GROUP_SIZE,
+    )
+    os.replace(tmp_file, path)
+    return True
+
+
+def _repair_worker(path: Path) -> tuple:
+    try:
+        return ("repaired" if repair_header_parquet(path) else "ok"), None
+    except Exception as e:
+        return "error", str(e)
+
+
+def run_in_pool(worker, tasks: dict, workers: int):
+    """
+    Yields (task key, result) of `worker(*args)` for every task, in a spawn-context process pool.
+    With a single worker the tasks run in this process.
+    """
+    if min(workers, len(tasks)) <= 1:
+        for key, args in tasks.items():
+            yield key, worker(*args)
+        return
+
+    # Każdy proces ma własną pulę wątków polars; jeden wątek na proces wystarcza przy wielu plikach
+    os.environ.setdefault("POLARS_MAX_THREADS", "1")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as executor:
+        futures = {executor.submit(worker, *args): key for key, args in tasks.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def ingest(source_root: Path = source_dir, target_root: Path = target_dir, workers: int = max_workers) -> None:
+    """
+    Converts every new or changed CSV under `source_root` into Parquet under `target_root`.
+    """
     all_files = [
-        f for f in source_dir.rglob("*")
+        f for f in source_root.rglob("*")
         if f.is_file() and f.name.endswith((".csv", ".csv.gz"))
     ]
 
@@ -38,12 +225,51 @@ def main():
         print("Brak plików do przetworzenia.")
         return
 
-    print(f"Znaleziono {len(all_files)} plików. Rozpoczynam konwersję...")
+    manifest = load_manifest(target_root)
+    pending = [f for f in all_files if not is_unchanged(f, manifest.get(str(f)))]
+    print(f"Znaleziono {len(all_files)} plików, do konwersji: {len(pending)}.")
+    if not pending:
+        return
+
+    tasks = {f: (f, target_path(f, source_root, target_root), manifest.get(str(f))) for f in pending}
+    try:
+        for source_file, (status, result) in run_in_pool(convert_csv_to_parquet, tasks, workers):
+            if status == "error":
+                print(f"❌ Błąd: {source_file} -> {result}")
+                continue
+            manifest[str(source_file)] = result
+            if status == "converted":
+                print(f"✔️ Zapisano: {result['target']}")
+            elif status == "empty":
+                print(f"Pusty plik: {source_file}, pomijam.")
+    finally:
+        save_manifest(target_root, manifest)
+
+
+def repair(target_root: Path = target_dir, workers: int = max_workers) -> None:
+    """
+    One-off bulk repair of Parquet files written by the old header-reading converters.
+
+    Replaces the per-file `fix_parquet_with_header_data` pass: afterwards every file can be
+    read directly as (timestamp, value).
+    """
+    files = [f for f in target_root.rglob("*.parquet") if not f.name.startswith("._")]
+    print(f"Sprawdzam {len(files)} plików Parquet...")
+    repaired = 0
+    for path, (status, error) in run_in_pool(_repair_worker, {f: (f,) for f in files}, workers):
+        if status == "error":
+            print(f"❌ Błąd: {path} -> {error}")
+        elif status == "repaired":
+            repaired += 1
+    print(f"Naprawiono {repaired} plików.")
+
+
+def main():
+    if "--repair" in sys.argv[1:]:
+        repair()
+    else:
+        ingest()
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(convert_csv_to_parquet, f) for f in all_files]
-        for future in as_completed(futures):
-            future.result()  # Wyłapuje ewentualne wyjątki
 
 if __name__ == "__main__":
     main()
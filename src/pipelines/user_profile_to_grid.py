@@ -1,8 +1,8 @@
 import polars as pl
-import duckdb
-import numpy as np
+import pyarrow.parquet as pq
 from pathlib import Path
 import os
+import shutil
 import sys
 
 sys.path.append(os.path.abspath(os.path.join("../../")))
@@ -12,29 +12,73 @@ DEST_COLS = ["co2_emission_kg", "cost_pln", "normalized_comfort", "normalized_fa
 ALL_WEIGHT_COLS = DEST_COLS + QUALITY_COLS
 
 
-def load_and_merge_parquets(folder: Path) -> pl.DataFrame:
+GRID_FILE_PATTERN = "*_grid.parquet"
+PROFILE_DATASET_NAME = "grid_with_profiles"
+PARTITION_COLS = ["profile", "category"]
+SORT_COLS = ["optimal_device"] + ALL_WEIGHT_COLS
+
+
+def grid_paths(folder: Path) -> list:
+    """
+    Function to list the category grid files in a given folder.
+    Args:
+        folder (Path): Path to the folder containing the `<category>_grid.parquet` files.
+    """
+
+    paths = sorted(p for p in folder.glob(GRID_FILE_PATTERN) if p.name != "merged_grid.parquet")
+    if not paths:
+        raise FileNotFoundError(f"No {GRID_FILE_PATTERN} files in {folder}")
+    return paths
+
+
+def scan_grid(path: Path) -> pl.LazyFrame:
     """
-    Function to load and merge all Parquet files in a given folder into a single DataFrame in Polars.
+    Function to lazily scan one category grid file, adding its source 'category' taken from the file name.
+    Weight columns the category does not use are added as nulls, so every grid has the same columns.
+    Grids written with int8 step indices (`WEIGHT_FORMAT = "int8"` in generate_grid.py) are decoded
+    to float32 weights, as `src.comparisons.grid.read_grid_parquet` does.
     Args:
-        folder (Path): Path to the folder containing Parquet files.
+        path (Path): Path to a `<category>_grid.parquet` file.
     """
 
-    con = duckdb.connect()
-    query = f"""
-    COPY (
-        SELECT * FROM read_parquet('{str(folder)}/*.parquet', union_by_name=True)
-    ) TO '{str(folder / "merged_grid.parquet")}' (FORMAT PARQUET);
+    df = pl.scan_parquet(path)
+    schema = df.collect_schema()
+    metadata = pq.read_schema(path).metadata or {}
+    if metadata.get(b"grid_weight_format") == b"int8":
+        n_units = int(metadata[b"grid_units_per_weight"])
+        df = df.with_columns([
+            (pl.col(c).cast(pl.Float32) / pl.lit(n_units, dtype=pl.Float32)).alias(c)
+            for c in ALL_WEIGHT_COLS if c in schema
+        ])
+        schema = df.collect_schema()
+    weight_dtype = schema["cost_pln"]
+    return df.with_columns(
+        [pl.lit(None, dtype=weight_dtype).alias(c) for c in ALL_WEIGHT_COLS if c not in schema]
+        + [
+            pl.col("optimal_device").cast(pl.String),
+            pl.lit(path.name.removesuffix("_grid.parquet")).alias("category"),
+        ]
+    )
+
+
+def scan_grids(folder: Path) -> pl.LazyFrame:
+    """
+    Function to lazily scan all category grid files in a given folder as one LazyFrame in Polars.
+    Columns missing in some grids (e.g. the quality columns) are filled with nulls, as in a union by name.
+    Nothing is read until the query is collected or sunk.
+    Args:
+        folder (Path): Path to the folder containing the `<category>_grid.parquet` files.
     """
-    con.execute(query)
-    return pl.read_parquet(folder / "merged_grid.parquet")
+
+    return pl.concat([scan_grid(path) for path in grid_paths(folder)], how="diagonal_relaxed")
 
 
-def clean_data(df: pl.DataFrame) -> pl.DataFrame:
+def clean_data(df: pl.LazyFrame) -> pl.LazyFrame:
     """
     Function to clean the DataFrame by removing rows with invalid values in destination columns
     and stymulant columns, and negating certain numeric columns.
     Args:
-        df (pl.DataFrame): Input DataFrame with raw data.
+        df (pl.LazyFrame): Input LazyFrame with raw data.
     """
 
     mask_wrong_dest = pl.any_horizontal([
@@ -46,8 +90,9 @@ def clean_data(df: pl.DataFrame) -> pl.DataFrame:
     df = df.filter(~mask_wrong_dest & ~mask_wrong_stymulant)
 
     exclude = set(QUALITY_COLS + ["device_cost"])
+    schema = df.collect_schema()
     numeric_cols = [
-        col for col in df.columns if df.schema[col] in [pl.Float64, pl.Float32, pl.Int64, pl.Int32]
+        col for col, dtype in schema.items() if dtype in [pl.Float64, pl.Float32, pl.Int64, pl.Int32]
     ]
     cols_to_negate = [col for col in numeric_cols if col not in exclude]
 
@@ -57,36 +102,18 @@ def clean_data(df: pl.DataFrame) -> pl.DataFrame:
     ])
 
 
-def compute_abs_weights(df: pl.DataFrame) -> pl.DataFrame:
-    """ Function to compute absolute weights for the specified columns in the DataFrame.
-    It creates a new column 'abs_weights_list_clean' that contains a list of absolute values
-    for the specified weight columns, ensuring that null values are handled correctly.
-    Args:
-        df (pl.DataFrame): Input DataFrame with raw data.
-    """
-
-    return df.with_columns([
-        pl.concat_list([
-            pl.when(pl.col(c).is_not_null()).then(pl.col(c).abs()) for c in ALL_WEIGHT_COLS
-        ]).alias("abs_weights_list_clean")
-    ])
-
-
-def compute_balance_flag(df: pl.DataFrame) -> pl.DataFrame:
-    """ Function to compute a balance flag for the DataFrame.
-    It checks if all absolute weights in the 'abs_weights_list_clean' column are equal
-    and creates a new boolean column 'is_balanced' indicating whether the weights are balanced.
+def compute_balance_flag(df: pl.LazyFrame) -> pl.LazyFrame:
+    """ Function to compute a balance flag for the LazyFrame.
+    A row is balanced when all non-null absolute weights are equal, i.e. when their horizontal
+    minimum equals their horizontal maximum. Rows without any weight are not balanced.
+    Creates a new boolean column 'is_balanced'.
     Args:
-        df (pl.DataFrame): Input DataFrame with absolute weights.
+        df (pl.LazyFrame): Input LazyFrame with raw data.
     """
 
-    vectors = df["abs_weights_list_clean"].to_list()
-    vectors = [[v for v in vec if v is not None] for vec in vectors]
-    is_balanced = np.array([
-        np.all(np.array(vec) == vec[0]) if len(vec) > 0 else False for vec in vectors
-    ])
+    abs_weights = [pl.col(c).abs() for c in ALL_WEIGHT_COLS]
     return df.with_columns([
-        pl.Series(name="is_balanced", values=is_balanced)
+        (pl.max_horizontal(abs_weights) == pl.min_horizontal(abs_weights)).fill_null(False).alias("is_balanced")
     ])
 
 
@@ -108,12 +135,12 @@ def unique_param_expr(not_null_counts) -> pl.Expr:
     )
 
 
-def enrich_with_stats(df: pl.DataFrame) -> pl.DataFrame:
+def enrich_with_stats(df: pl.LazyFrame) -> pl.LazyFrame:
     """ Function to enrich the DataFrame with statistical features.
     It computes the unique parameter, maximum quality value, absolute device cost,
     and maximum absolute weight for each row.
     Args:
-        df (pl.DataFrame): Input DataFrame with raw data.
+        df (pl.LazyFrame): Input LazyFrame with raw data.
     """
 
     not_null_counts = pl.sum_horizontal([
@@ -127,12 +154,12 @@ def enrich_with_stats(df: pl.DataFrame) -> pl.DataFrame:
     ])
 
 
-def assign_profile(df: pl.DataFrame) -> pl.DataFrame:
+def assign_profile(df: pl.LazyFrame) -> pl.LazyFrame:
     """ Function to assign user profiles based on the computed statistics.
     It creates a new column 'profile' that categorizes each row into a specific user profile
     based on the balance flag and the maximum absolute weight.
     Args:
-        df (pl.DataFrame): Input DataFrame with enriched statistics.
+        df (pl.LazyFrame): Input LazyFrame with enriched statistics.
     """
 
     return df.with_columns([
@@ -148,31 +175,58 @@ def assign_profile(df: pl.DataFrame) -> pl.DataFrame:
     ])
 
 
+def build_profile_query(grids: pl.LazyFrame) -> pl.LazyFrame:
+    """ Function to build the whole grid-to-profile pipeline as a single lazy query.
+    Args:
+        grids (pl.LazyFrame): Scanned grids, see `scan_grid` and `scan_grids`.
+    """
+
+    df = clean_data(grids)
+    df = compute_balance_flag(df)
+    df = enrich_with_stats(df)
+    df = assign_profile(df)
+    return df.drop(["is_balanced", "max_quality_value", "abs_device_cost", "max_abs_weight"])
+
+
+def write_profile_dataset(folder: Path, target: Path) -> None:
+    """ Function to write the profiled grids as a hive-partitioned Parquet dataset
+    (`profile=<profile>/category=<category>/`), so readers can prune partitions with filters
+    such as `[("profile", "==", "Saver")]`.
+    Each category grid goes through `build_profile_query` and is sorted by `SORT_COLS` before it is
+    sunk into its partitions, so rows within a partition are ordered by device and weights and the
+    Parquet row-group min/max statistics let readers skip row groups inside a partition.
+    The sort needs one category in memory at a time, never the whole profiled grid.
+    The dataset is built next to `target` and swapped in when complete.
+    Args:
+        folder (Path): Path to the folder containing the category grid files.
+        target (Path): Path of the dataset directory.
+    """
+
+    tmp_target = target.with_name(f"{target.name}.tmp")
+    if tmp_target.exists():
+        shutil.rmtree(tmp_target)
+    for path in grid_paths(folder):
+        # Każda kategoria trafia do własnych katalogów category=<category>, więc zapisy się nie nakładają
+        build_profile_query(scan_grid(path)).sort(PARTITION_COLS + SORT_COLS, nulls_last=True).sink_parquet(
+            pl.PartitionBy(tmp_target, key=PARTITION_COLS, include_key=False),
+            compression="zstd",
+            row_group_size=65536,
+            mkdir=True,
+        )
+
+    old_target = target.with_name(f"{target.name}.old")
+    if target.exists():
+        os.replace(target, old_target)
+    os.replace(tmp_target, target)
+    if old_target.exists():
+        shutil.rmtree(old_target)
+
+
 def main():
     folder = Path("../../DATA/GRID").expanduser()
-    print("Merging Parquets......")
-    df_raw = load_and_merge_parquets(folder)
-    print("Successfully merged Parquets!")
-    print("Cleaning data......")
-    df_clean = clean_data(df_raw)
-    print("Data cleaned successfully!")
-    print("Computing absolute weights......")
-    df_weights = compute_abs_weights(df_clean)
-    print("Absolute weights computed successfully!")
-    print("Computing balance flag......")
-    df_flagged = compute_balance_flag(df_weights)
-    print("Balance flag computed successfully!")
-    print("Enriching with statistics......")
-    df_stats = enrich_with_stats(df_flagged)
-    print("Statistics enriched successfully!")
-    print("Assigning user profiles......")
-    df_final = assign_profile(df_stats)
-    print("User profiles assigned successfully!")
-    print("Finalizing DataFrame......")
-    df_final = df_final.drop(["abs_weights_list_clean", "is_balanced", "max_quality_value", "abs_device_cost", "max_abs_weight"])
-    print("Final DataFrame ready!")
-    df_final.write_parquet(folder / "grid_with_profiles.parquet")
-    print(f'************Correctly saved file grid_user_profile.parquet to: {folder}***************')
+    print("Writing partitioned grid_with_profiles dataset......")
+    write_profile_dataset(folder, folder / PROFILE_DATASET_NAME)
+    print(f'************Correctly saved dataset {PROFILE_DATASET_NAME} to: {folder}***************')
 
 
 if __name__ == "__main__":
@@ -6,11 +6,9 @@ import pickle
 from src.recommendation_engine.recommend_best_device_per_group import recommend_best_per_group
 from src.recommendation_engine.comparing_devices import comparing_devices
 
-df = pd.read_parquet("../../../Data/GRID/grid_with_profiles.parquet")
+# delete balanced profiles (pruned at partition level)
+df = pd.read_parquet("../../../Data/GRID/grid_with_profiles", filters=[("profile", "!=", "Balanced")])
 df[df.select_dtypes(include=['float']).columns] = df.select_dtypes(include=['float']).round(1)
-
-# delete balanced profiles
-df = df[df["profile"] != "Balanced"]
 df.drop(columns=["optimal_score", "unique_parameter",], inplace=True)
 
 unique_profiles = df["profile"].unique()
@@ -0,0 +1,60 @@
+import pandas as pd
+import sys
+import os
+from pathlib import Path
+sys.path.append(os.path.abspath(os.path.join("../../")))
+import pickle
+from src.recommendation_engine.artifact_registry import REPO_ROOT, ARTIFACTS, write_manifest
+
+# Ścieżki liczone od katalogu repozytorium, niezależnie od katalogu uruchomienia
+GRID_DATASET = REPO_ROOT / "Data" / "GRID" / "grid_with_profiles"
+OUTPUT_PATH = REPO_ROOT / ARTIFACTS["profile_aggregates"]
+FEATURE_COLS = ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "quality"]
+QUALITY_COLS = ["heating_quality", "optimal_device", "cooling_quality", "cooking_quality", "computing_quality"]
+
+
+def profile_feature_means(df: pd.DataFrame) -> pd.Series:
+    """
+    Średnie cech dla jednego profilu – te same kroki co dawniej w generate_spider_chart.
+    Wagi w siatce są float32, więc przed zaokrągleniem i uśrednieniem rzutujemy je na float64
+    (inaczej np. średnia device_cost wychodzi -4e-10 zamiast 0).
+    """
+    float_cols = df.select_dtypes(include=['float']).columns
+    df[float_cols] = df[float_cols].astype("float64").round(1)
+    df['quality'] = df[QUALITY_COLS].bfill(axis=1).iloc[:, 0]
+    df['quality'] = pd.to_numeric(df['quality'], errors='coerce')
+    return df[FEATURE_COLS].mean()
+
+
+def prepare_profile_aggregates(grid_dataset: Path = GRID_DATASET) -> pd.DataFrame:
+    """
+    Zbiera średnie cech dla każdego profilu (to, co czyta wykres radarowy).
+    """
+    # Każdy profil czytamy osobno (partycja datasetu), więc w pamięci jest tylko jedna partycja naraz
+    profiles = sorted(path.name.split("=", 1)[1] for path in grid_dataset.glob("profile=*"))
+    rows = []
+    for profile in profiles:
+        # delete balanced profiles
+        if profile == "Balanced":
+            continue
+        df = pd.read_parquet(grid_dataset, filters=[("profile", "==", profile)])
+        df["profile"] = df["profile"].astype(str)
+
+        for feature, value in profile_feature_means(df.copy()).items():
+            # zaokrąglenie do wyświetlenia usuwa resztki rzędu 1e-19; "+ 0.0" zamienia -0.0 na 0.0
+            rows.append({"profile": profile, "kind": "feature_mean", "name": feature, "value": round(float(value), 6) + 0.0})
+
+    return pd.DataFrame(rows, columns=["profile", "kind", "name", "value"])
+
+
+def main(grid_dataset: Path = GRID_DATASET):
+    profile_aggregates = prepare_profile_aggregates(grid_dataset)
+    with open(OUTPUT_PATH, "wb") as f:
+        pickle.dump(profile_aggregates, f)
+    print(f"Zapisano: {OUTPUT_PATH}")
+    # nowa wersja pliku wymaga nowej sumy kontrolnej w manifeście artefaktów; pozostałe wpisy zostają
+    write_manifest(["profile_aggregates"])
+
+
+if __name__ == "__main__":
+    main()
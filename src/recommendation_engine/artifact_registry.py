@@ -0,0 +1,234 @@
+import sys
+import os
+import json
+import pickle
+import hashlib
+import threading
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join("../../")))
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MANIFEST_PATH = REPO_ROOT / "models" / "artifacts.json"
+MANIFEST_FORMAT_VERSION = 1
+
+# Artifact name -> path relative to the repository root
+ARTIFACTS = {
+    "user_profile_model": "models/user_profile_model.pkl",
+    "user_profile_model_compiled": "models/user_profile_model_compiled.npz",
+    "feature_order": "models/feature_order_user_profile_model.pkl",
+    "combined_df": "src/recommendation_engine/pickles/combined_df.pkl",
+    "appliance_recommendations_for_profiles": "src/recommendation_engine/pickles/appliance_recommendations_for_profiles.pkl",
+    "profile_aggregates": "src/recommendation_engine/pickles/profile_aggregates.pkl",
+}
+
+
+def _load_compiled_model(path: Path):
+    from src.recommendation_engine.compiled_profile_model import CompiledProfileModel
+    return CompiledProfileModel.load(path)
+
+
+# Artifacts that are not plain pickles
+LOADERS = {
+    "user_profile_model_compiled": _load_compiled_model,
+}
+
+
+class ArtifactIntegrityError(ValueError):
+    """Raised when an artifact on disk does not match the checksum recorded in the manifest."""
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path: Path = MANIFEST_PATH) -> dict:
+    """
+    Reads the artifact manifest ({"format_version": ..., "artifacts": {name: {"path", "sha256", "version"}}}).
+
+    Returns:
+        dict: Mapping of artifact name to its manifest entry (empty if there is no manifest).
+    """
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact manifest version: {manifest.get('format_version')}")
+    return manifest["artifacts"]
+
+
+def write_manifest(names: list = None, artifacts: dict = ARTIFACTS, root: Path = REPO_ROOT,
+                   manifest_path: Path = MANIFEST_PATH) -> dict:
+    """
+    Records the current checksum of the given artifacts in the manifest.
+
+    Only the entries of `names` are rehashed; the entries of all other artifacts are kept as
+    they are, so a pipeline that writes one artifact never approves changes to the others.
+    The version of an artifact is bumped whenever its checksum changes. Pipelines call this
+    with the artifacts they have just written; `main` records the artifacts named on the
+    command line (all of them when none are given).
+
+    Args:
+        names (list, optional): Artifacts to record. None records every existing artifact.
+
+    Returns:
+        dict: The new manifest entries.
+    """
+    previous = load_manifest(manifest_path)
+    entries = dict(previous)
+    for name in (artifacts if names is None else names):
+        relative_path = artifacts[name]
+        path = root / relative_path
+        if not path.exists():
+            if names is not None:
+                raise FileNotFoundError(f"Artifact {name} not found: {path}")
+            continue
+        sha256 = file_sha256(path)
+        old = previous.get(name, {})
+        version = old.get("version", 0) + (old.get("sha256") != sha256)
+        entries[name] = {"path": relative_path, "sha256": sha256, "version": version}
+
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format_version": MANIFEST_FORMAT_VERSION, "artifacts": entries}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, manifest_path)
+    return entries
+
+
+class ArtifactRegistry:
+    """
+    Loads models and precomputed tables once per process and serves them from memory.
+
+    Each artifact is verified against the sha256 checksum in the manifest when it is loaded;
+    an artifact without a manifest entry is refused. On every `get` the modification time and
+    size of the file and of the manifest are compared with the loaded copy (two `stat` calls);
+    if either changed, the artifact is reloaded and verified again. If a reload fails (e.g. the
+    file is being replaced, or the manifest has not been updated yet), the last good copy is
+    kept and the reload is retried as soon as the file or the manifest changes again.
+    """
+
+    def __init__(self, artifacts: dict = ARTIFACTS, root: Path = REPO_ROOT, manifest_path: Path = MANIFEST_PATH,
+                 loaders: dict = LOADERS):
+        """
+        Args:
+            artifacts (dict): Mapping of artifact name to path relative to `root`.
+            root (Path): Repository root, so paths do not depend on the working directory.
+            manifest_path (Path): Manifest with the expected checksums and versions.
+            loaders (dict): Mapping of artifact name to `loader(path)`; other artifacts are unpickled.
+        """
+        self.artifacts = dict(artifacts)
+        self.root = Path(root)
+        self.manifest_path = Path(manifest_path)
+        self.loaders = dict(loaders)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, relative_path: str, loader=None) -> None:
+        """
+        Adds an artifact. `loader(path)` builds the object from the file (pickle by default).
+        """
+        with self._lock:
+            self.artifacts[name] = relative_path
+            if loader is not None:
+                self.loaders[name] = loader
+            self._loaded.pop(name, None)
+
+    def path(self, name: str) -> Path:
+        return self.root / self.artifacts[name]
+
+    def _load(self, name: str, path: Path, stamp: tuple) -> dict:
+        entry = load_manifest(self.manifest_path).get(name)
+        if entry is None:
+            raise ArtifactIntegrityError(
+                f"Artifact {name} has no entry in {self.manifest_path}; run artifact_registry.py to record it"
+            )
+        sha256 = file_sha256(path)
+        if entry["sha256"] != sha256:
+            raise ArtifactIntegrityError(
+                f"Checksum of {path} does not match the manifest (version {entry['version']})"
+            )
+        loader = self.loaders.get(name)
+        if loader is None:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        else:
+            value = loader(path)
+        return {
+            "value": value,
+            "stamp": stamp,
+            "sha256": sha256,
+            "version": entry["version"],
+        }
+
+    def _stamp(self, path: Path) -> tuple:
+        stat = path.stat()
+        try:
+            manifest_stat = self.manifest_path.stat()
+            manifest_stamp = (manifest_stat.st_mtime_ns, manifest_stat.st_size)
+        except FileNotFoundError:
+            manifest_stamp = None
+        return stat.st_mtime_ns, stat.st_size, manifest_stamp
+
+    def _current(self, name: str) -> dict:
+        path = self.path(name)
+        stamp = self._stamp(path)
+        loaded = self._loaded.get(name)
+        if loaded is not None and stamp in (loaded["stamp"], loaded.get("failed_stamp")):
+            return loaded
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is not None and stamp in (loaded["stamp"], loaded.get("failed_stamp")):
+                return loaded
+            try:
+                self._loaded[name] = self._load(name, path, stamp)
+            except Exception as e:
+                if loaded is None:
+                    raise
+                print(f"Nie udało się przeładować artefaktu {name}: {e}. Używam poprzedniej wersji.")
+                # the stamp of the good copy stays; this one is only remembered to avoid re-hashing
+                loaded["failed_stamp"] = stamp
+            return self._loaded[name]
+
+    def get(self, name: str):
+        """
+        Returns:
+            The loaded artifact, reloaded first if its file changed since the last call.
+        """
+        return self._current(name)["value"]
+
+    def version(self, name: str):
+        """
+        Returns:
+            int: Manifest version of the loaded artifact.
+        """
+        return self._current(name)["version"]
+
+
+REGISTRY = ArtifactRegistry()
+
+
+def get_artifact(name: str):
+    """
+    Returns the artifact `name` from the process-wide registry.
+    """
+    return REGISTRY.get(name)
+
+
+def main():
+    names = sys.argv[1:] or None
+    entries = write_manifest(names)
+    for name, entry in entries.items():
+        if names is not None and name not in names:
+            continue
+        print(f"{name}: v{entry['version']} {entry['sha256'][:12]}")
+    print(f"Zapisano manifest: {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import sys
+import os
+from functools import lru_cache
+sys.path.append(os.path.abspath(os.path.join("../../")))
+import numpy as np
+
+
+class CompiledProfileModel:
+    """
+    Lightweight inference copy of the fitted HistGradientBoostingClassifier.
+
+    All trees are flattened into one set of NumPy node arrays, so predictions need neither
+    sklearn nor its per-call input validation. Trees are traversed exactly like sklearn does
+    for numerical splits: NaN follows `missing_go_to_left`, otherwise `x <= threshold` goes left.
+    Raw scores are the baseline plus the leaf values of every iteration, turned into
+    probabilities with a softmax (multiclass) or a sigmoid (binary).
+    """
+
+    def __init__(self, feature_idx, threshold, missing_go_to_left, left, right, is_leaf, value,
+                 roots, baseline, classes, feature_names):
+        """
+        Args:
+            feature_idx, threshold, missing_go_to_left, left, right, is_leaf, value (np.ndarray):
+                Node arrays of all trees; `left` and `right` are global node indices.
+            roots (np.ndarray): Root node of every tree, shape (n_iterations, n_trees_per_iteration).
+            baseline (np.ndarray): Baseline raw score per tree of an iteration.
+            classes (np.ndarray): Class labels, as `model.classes_`.
+            feature_names (np.ndarray): Feature order expected by the model.
+        """
+        self.feature_idx = feature_idx
+        self.threshold = threshold
+        self.missing_go_to_left = missing_go_to_left
+        self.left = left
+        self.right = right
+        self.is_leaf = is_leaf
+        self.value = value
+        self.roots = roots
+        self.baseline = baseline
+        self.classes_ = classes
+        self.feature_names_in_ = feature_names
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Flattens a fitted HistGradientBoostingClassifier with numerical features only.
+        """
+        nodes = [predictor.nodes for iteration in model._predictors for predictor in iteration]
+        if any(node["is_categorical"].any() for node in nodes):
+            raise ValueError("Categorical splits are not supported by the compiled model")
+
+        offsets = np.cumsum([0] + [len(node) for node in nodes[:-1]])
+        flat = np.concatenate(nodes)
+        tree_offsets = np.repeat(offsets, [len(node) for node in nodes])
+        return cls(
+            feature_idx=flat["feature_idx"].astype(np.int64),
+            threshold=flat["num_threshold"].astype(np.float64),
+            missing_go_to_left=flat["missing_go_to_left"].astype(bool),
+            left=flat["left"].astype(np.int64) + tree_offsets,
+            right=flat["right"].astype(np.int64) + tree_offsets,
+            is_leaf=flat["is_leaf"].astype(bool),
+            value=flat["value"].astype(np.float64),
+            roots=offsets.reshape(len(model._predictors), model.n_trees_per_iteration_),
+            baseline=np.asarray(model._baseline_prediction, dtype=np.float64).ravel(),
+            classes=np.asarray(model.classes_).astype(str),
+            feature_names=np.asarray(model.feature_names_in_).astype(str),
+        )
+
+    def save(self, path) -> None:
+        np.savez(path, **{name: getattr(self, attribute) for name, attribute in _FIELDS.items()})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in _FIELDS})
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            X = X.to_numpy(dtype=np.float64) if list(X.columns) == list(self.feature_names_in_) else X[list(self.feature_names_in_)]
+        return np.ascontiguousarray(np.asarray(X, dtype=np.float64).reshape(-1, len(self.feature_names_in_)))
+
+    def _leaf_values(self, X: np.ndarray) -> np.ndarray:
+        # All trees are walked at once, one level per step, for the (row, tree) pairs not yet in a leaf
+        n_trees = self.roots.size
+        node = np.tile(self.roots.ravel(), X.shape[0])
+        row = np.repeat(np.arange(X.shape[0]), n_trees)
+        pending = np.flatnonzero(~self.is_leaf[node])
+        while pending.size:
+            current = node[pending]
+            x = X[row[pending], self.feature_idx[current]]
+            go_left = np.where(np.isnan(x), self.missing_go_to_left[current], x <= self.threshold[current])
+            child = np.where(go_left, self.left[current], self.right[current])
+            node[pending] = child
+            pending = pending[~self.is_leaf[child]]
+        return self.value[node].reshape(X.shape[0], *self.roots.shape)
+
+    def decision_function(self, X, backend: str = "numpy") -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: Raw scores of shape (n_samples, n_trees_per_iteration).
+        """
+        X = self._as_matrix(X)
+        if backend == "numba":
+            raw = np.empty((X.shape[0], self.roots.shape[1]))
+            _numba_predict_raw()(X, self.feature_idx, self.threshold, self.missing_go_to_left, self.left,
+                                 self.right, self.is_leaf, self.value, self.roots, self.baseline, raw)
+            return raw
+        if backend != "numpy":
+            raise ValueError(f"Unknown backend: {backend}")
+
+        leaf_values = self._leaf_values(X)
+        raw = np.tile(self.baseline, (X.shape[0], 1))
+        # Iterations are added one by one, in the same order as sklearn
+        for iteration in range(leaf_values.shape[1]):
+            raw += leaf_values[:, iteration]
+        return raw
+
+    def predict_proba(self, X, backend: str = "numpy") -> np.ndarray:
+        """
+        Args:
+            X (pd.DataFrame or array-like): Rows in model scale; DataFrame columns are aligned by name.
+            backend (str): "numpy", or "numba" for the compiled traversal (requires numba).
+
+        Returns:
+            np.ndarray: Class probabilities of shape (n_samples, n_classes).
+        """
+        raw = self.decision_function(X, backend)
+        if raw.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-raw[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        exp = np.exp(raw - raw.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, X, backend: str = "numpy") -> np.ndarray:
+        return self.classes_[self.predict_proba(X, backend).argmax(axis=1)]
+
+
+_FIELDS = {
+    "feature_idx": "feature_idx",
+    "threshold": "threshold",
+    "missing_go_to_left": "missing_go_to_left",
+    "left": "left",
+    "right": "right",
+    "is_leaf": "is_leaf",
+    "value": "value",
+    "roots": "roots",
+    "baseline": "baseline",
+    "classes": "classes_",
+    "feature_names": "feature_names_in_",
+}
+
+
+@lru_cache(maxsize=None)
+def _numba_predict_raw():
+    """
+    Compile (once per process) the numba traversal used by the "numba" backend.
+    """
+    import numba
+
+    @numba.njit(parallel=True)
+    def kernel(X, feature_idx, threshold, missing_go_to_left, left, right, is_leaf, value, roots, baseline, raw):
+        n_iterations, n_trees = roots.shape
+        for i in numba.prange(X.shape[0]):
+            for k in range(n_trees):
+                score = baseline[k]
+                for iteration in range(n_iterations):
+                    node = roots[iteration, k]
+                    while not is_leaf[node]:
+                        x = X[i, feature_idx[node]]
+                        if np.isnan(x):
+                            go_left = missing_go_to_left[node]
+                        else:
+                            go_left = x <= threshold[node]
+                        node = left[node] if go_left else right[node]
+                    score += value[node]
+                raw[i, k] = score
+
+    return kernel
+
+
+def main():
+    from src.recommendation_engine.artifact_registry import REGISTRY, write_manifest
+
+    # the source model is checked against the manifest before it is compiled
+    model = REGISTRY.get("user_profile_model")
+    compiled_path = REGISTRY.path("user_profile_model_compiled")
+    compiled = CompiledProfileModel.from_sklearn(model)
+    compiled.save(compiled_path)
+    print(f"Zapisano skompilowany model: {compiled_path}")
+    # only the new file gets a fresh checksum in the artifact manifest
+    write_manifest(["user_profile_model_compiled"])
+
+
+if __name__ == "__main__":
+    main()
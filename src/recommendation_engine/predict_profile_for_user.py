@@ -3,7 +3,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join("../../")))
 import numpy as np
 import pandas as pd
-from src.recommendation_engine.validate_user_input import validate_user_input
+from src.recommendation_engine.validate_user_input import validate_user_input, validate_user_inputs
 
 """ 
 def predict_profile_for_user(user_input: dict, model, feature_order: list):
@@ -33,38 +33,59 @@ def predict_profile_for_user(user_input: dict, model, feature_order: list):
 import numpy as np
 import pandas as pd
 
-def predict_profile_for_user(user_input: dict, model, feature_order: list):
-    """ 
-    Predicts the user's profile class based on their preferences scaled to model input format. 
 
-    Returns the most probable and second-most probable class.
+def rescale_user_inputs(validated: pd.DataFrame, feature_order: list) -> pd.DataFrame:
     """
+    Rescales validated user-scale inputs to the model scale, aligned to `feature_order`.
 
-    def rescale(value, feature):
-        if value is None:
-            return None
-        if feature == "device_cost":
-            return np.clip(value / 10, -1, 1)  # -10 to 10
-        return np.clip(value / 10, 0, 1)       # 1 to 10
+    device_cost goes from [-10, 10] to [-1, 1], every other feature from [0, 10] to [0, 1].
+    Missing values stay NaN.
+    """
+    columns = {}
+    for feat in feature_order:
+        values = validated[feat].to_numpy(dtype=float) if feat in validated else np.full(len(validated), np.nan)
+        low = -1 if feat == "device_cost" else 0
+        columns[feat] = np.clip(values / 10, low, 1)
+    return pd.DataFrame(columns, index=validated.index)
 
-    validated_user_input = validate_user_input(user_input)
 
-    # scale and align
-    input_scaled = {
-        feat: rescale(validated_user_input.get(feat, np.nan), feat)
-        for feat in feature_order
-    }
+def predict_profiles_batch(user_inputs, model, feature_order: list, k: int = 2):
+    """
+    Predicts the profile classes of many users with a single `predict_proba` call.
+
+    Args:
+        user_inputs (pd.DataFrame, dict of columns or list of dicts): One row per user, in user scale.
+        model: Fitted classifier with `predict_proba` and `classes_`.
+        feature_order (list): Feature order expected by the model.
+        k (int): Number of most probable classes to return per user.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Top-k classes and their probabilities, both of shape
+            (n_users, k), most probable first.
+    """
+    input_scaled = rescale_user_inputs(validate_user_inputs(user_inputs), feature_order)
+    return _predict_top_k(input_scaled, model, k)
+
+
+def _predict_top_k(input_scaled: pd.DataFrame, model, k: int):
+    proba = model.predict_proba(input_scaled)
+    top_k = np.argsort(proba, axis=1)[:, ::-1][:, :k]  # descending sort
+
+    return np.asarray(model.classes_)[top_k], np.take_along_axis(proba, top_k, axis=1)
 
-    df_input = pd.DataFrame([input_scaled])
 
-    # predict probabilities
-    proba = model.predict_proba(df_input)[0]
-    class_indices_sorted = np.argsort(proba)[::-1]  # descending sort
+def predict_profile_for_user(user_input: dict, model, feature_order: list):
+    """ 
+    Predicts the user's profile class based on their preferences scaled to model input format. 
 
-    top1_idx = class_indices_sorted[0]
-    top2_idx = class_indices_sorted[1]
+    Returns the most probable and second-most probable class.
+    """
+
+    validated_user_input = validate_user_input(user_input)
 
-    top1_class = model.classes_[top1_idx]
-    top2_class = model.classes_[top2_idx]
+    # already validated, so skip the vectorized validation of the batch path
+    input_scaled = rescale_user_inputs(pd.DataFrame([validated_user_input], dtype=float), feature_order)
+    classes, _ = _predict_top_k(input_scaled, model, k=2)
+    top1_class, top2_class = classes[0]
 
     return top1_class, top2_class
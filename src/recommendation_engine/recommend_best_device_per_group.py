@@ -32,3 +32,27 @@ def recommend_best_per_group(profile_label: str, df: pd.DataFrame, comparing_dic
                 best_score = ranked_dict.get(device, 0)
         best_per_group[group_name] = best_device
     return best_per_group
+
+
+# Cechy negowane w clean_data (user_profile_to_grid.py): w siatce wag mają znak przeciwny niż suwaki
+NEGATED_FEATURES = ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate"]
+
+
+def recommend_best_per_category_for_input(user_input: dict, indices: dict) -> dict:
+    """
+    Dla dokładnych ustawień suwaków użytkownika wybiera najlepsze urządzenie w każdej kategorii,
+    korzystając z DecisionRegionIndex (src/comparisons/decision_regions.py) zamiast siatki wag.
+
+    Zwraca słownik: {kategoria: (urządzenie, wynik, margines)}.
+    Kategorie, w których wszystkie wagi użytkownika są zerowe, są pomijane.
+    """
+    best_per_category = {}
+    for category, index in indices.items():
+        weights = {
+            feature: (-1.0 if feature in NEGATED_FEATURES else 1.0) * float(user_input.get(feature) or 0)
+            for feature in index.features
+        }
+        if not any(weights.values()):
+            continue
+        best_per_category[category] = index.lookup(weights)
+    return best_per_category
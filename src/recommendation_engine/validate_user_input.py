@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+
+
 def validate_user_input(user_input: dict) -> dict:
     """
     Validates user input for preference-based profile prediction.
@@ -47,3 +51,60 @@ def validate_user_input(user_input: dict) -> dict:
             validated[feature] = None
 
     return validated
+
+
+def validate_user_inputs(user_inputs) -> pd.DataFrame:
+    """
+    Vectorized counterpart of `validate_user_input` for many users at once.
+
+    Applies the same rules column by column instead of row by row. As in `validate_user_input`,
+    values must be numbers; numeric strings such as "3" are rejected.
+
+    Parameters
+    ----------
+    user_inputs : pd.DataFrame, dict of columns or list of dicts
+        One row per user, columns named like the keys of `validate_user_input`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Float columns for all base and specific features (missing specific values are NaN),
+        in the input row order. Raises ValueError naming the offending rows otherwise.
+    """
+    required_base = ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"]
+    optional_specific = ["heating_quality", "cooking_quality", "computing_quality", "cooling_quality"]
+
+    df = user_inputs if isinstance(user_inputs, pd.DataFrame) else pd.DataFrame(user_inputs)
+
+    def numeric(feature):
+        column = df[feature]
+        if pd.api.types.is_numeric_dtype(column):
+            return column.to_numpy(dtype=float, na_value=np.nan), np.zeros(len(df), dtype=bool)
+        # Mixed columns: same type check as validate_user_input, so strings like "3" are rejected
+        is_number = column.map(lambda val: isinstance(val, (int, float))).to_numpy(dtype=bool)
+        values = column.where(is_number).to_numpy(dtype=float, na_value=np.nan)
+        invalid = ~is_number & column.notna().to_numpy()
+        return values, invalid
+
+    validated = {}
+    for feature in required_base:
+        if feature not in df.columns:
+            raise ValueError(f"Missing required input: {feature}")
+        values, invalid = numeric(feature)
+        low = -10 if feature == "device_cost" else 0
+        invalid |= ~((values >= low) & (values <= 10))
+        if invalid.any():
+            raise ValueError(f"{feature} must be in range [{low}, 10] (rows: {df.index[invalid].tolist()})")
+        validated[feature] = values
+
+    for feature in optional_specific:
+        if feature not in df.columns:
+            validated[feature] = np.full(len(df), np.nan)
+            continue
+        values, invalid = numeric(feature)
+        invalid |= (values < 0) | (values > 10)
+        if invalid.any():
+            raise ValueError(f"{feature} must be in range [0, 10] if provided (rows: {df.index[invalid].tolist()})")
+        validated[feature] = values
+
+    return pd.DataFrame(validated, index=df.index)
@@ -0,0 +1,48 @@
+import pickle
+
+import pytest
+
+from src.recommendation_engine.artifact_registry import ArtifactIntegrityError, ArtifactRegistry, load_manifest, write_manifest
+
+ARTIFACTS = {"model": "models/model.pkl", "table": "pickles/table.pkl"}
+
+
+def dump(path, value):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(value, f)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    dump(tmp_path / ARTIFACTS["model"], "model v1")
+    dump(tmp_path / ARTIFACTS["table"], "table v1")
+    write_manifest(artifacts=ARTIFACTS, root=tmp_path, manifest_path=tmp_path / "artifacts.json")
+    return tmp_path
+
+
+def test_pipeline_update_keeps_other_entries(repo):
+    manifest_path = repo / "artifacts.json"
+    before = load_manifest(manifest_path)
+    dump(repo / ARTIFACTS["model"], "model v2")
+    dump(repo / ARTIFACTS["table"], "tampered table")
+
+    write_manifest(["model"], artifacts=ARTIFACTS, root=repo, manifest_path=manifest_path)
+
+    after = load_manifest(manifest_path)
+    assert after["model"]["version"] == before["model"]["version"] + 1
+    assert after["table"] == before["table"]
+    registry = ArtifactRegistry(ARTIFACTS, root=repo, manifest_path=manifest_path, loaders={})
+    assert registry.get("model") == "model v2"
+    with pytest.raises(ArtifactIntegrityError):
+        registry.get("table")
+
+
+def test_unknown_or_missing_artifact_is_refused(repo):
+    (repo / ARTIFACTS["table"]).unlink()
+    with pytest.raises(FileNotFoundError):
+        write_manifest(["table"], artifacts=ARTIFACTS, root=repo, manifest_path=repo / "artifacts.json")
+    registry = ArtifactRegistry({"other": "other.pkl"}, root=repo, manifest_path=repo / "artifacts.json", loaders={})
+    dump(repo / "other.pkl", "other")
+    with pytest.raises(ArtifactIntegrityError):
+        registry.get("other")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.appliances.base import as_batch_array
+from src.appliances.cooking import Kettle, InductionHob, GasHob
+from src.appliances.ovens import Microwave, ElectricOven, AirFryer, GasOven
+from src.appliances.coffee import ElectricMokaPot, CoffeeMachine
+from src.appliances.multicookers import ThermomixTM6, BoschCookit
+from src.appliances.heating import ElectricHeater, GasHeater, FlowHeater, HeatPump
+from src.appliances.bathing import Shower, Bathtub
+from src.appliances.bathroom_heating import LadderHeater, FloorHeating
+from src.appliances.workstations import DesktopComputer, LaptopWithMonitor
+from src.appliances.cooling import AirConditioner, Fan
+
+# (appliance, swept constructor parameter, values)
+CASES = [
+    (Kettle, "liters", np.round(np.arange(0.1, 3.0, 0.05), 2)),
+    (InductionHob, "liters", np.round(np.arange(0.1, 3.0, 0.05), 2)),
+    (GasHob, "liters", np.round(np.arange(0.1, 3.0, 0.05), 2)),
+    (Microwave, "time_minutes", np.arange(1, 61)),
+    (ElectricOven, "time_minutes", np.arange(1, 121)),
+    (AirFryer, "time_minutes", np.arange(1, 61)),
+    (GasOven, "time_minutes", np.arange(1, 121)),
+    (ElectricMokaPot, "cups", np.arange(1, 7)),
+    (CoffeeMachine, "cups", np.arange(1, 7)),
+    (ThermomixTM6, "recipe_complexity", np.round(np.arange(0.5, 3.0, 0.05), 2)),
+    (BoschCookit, "recipe_complexity", np.round(np.arange(0.5, 3.0, 0.05), 2)),
+    (ElectricHeater, "liters", np.arange(10, 301, 5)),
+    (GasHeater, "liters", np.arange(10, 301, 5)),
+    (FlowHeater, "liters", np.arange(10, 301, 5)),
+    (HeatPump, "cop", np.round(np.arange(2.0, 5.01, 0.05), 2)),
+    (Shower, "duration_min", np.arange(1, 31)),
+    (Bathtub, "liters", np.arange(50, 301, 5)),
+    (LadderHeater, "usage_hours_per_day", np.round(np.arange(0.5, 12.0, 0.25), 2)),
+    (FloorHeating, "area_m2", np.round(np.arange(1.0, 20.0, 0.5), 1)),
+    (DesktopComputer, "daily_hours", np.round(np.arange(0.5, 16.0, 0.5), 1)),
+    (LaptopWithMonitor, "daily_hours", np.round(np.arange(0.5, 16.0, 0.5), 1)),
+    (AirConditioner, "duration_min", np.arange(5, 241, 5)),
+    (Fan, "duration_min", np.arange(5, 241, 5)),
+]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [0.2375, 1.0045, 2.675, 0.125, 0.5, 1.5, 2.5, -0.0125, 0.1 + 0.2],
+)
+@pytest.mark.parametrize("ndigits", [0, 2, 3])
+def test_round_matches_builtin(value, ndigits):
+    assert round(as_batch_array(value), ndigits) == round(value, ndigits)
+    assert round(as_batch_array([value, value]), ndigits).tolist() == [round(value, ndigits)] * 2
+
+
+@pytest.mark.parametrize("cls, param, values", CASES, ids=[case[0].__name__ for case in CASES])
+def test_evaluate_batch_matches_summary(cls, param, values):
+    batch = cls.evaluate_batch(**{param: values})
+
+    for row, value in zip(batch.to_dict("records"), values.tolist()):
+        expected = cls(**{param: value}).summary()
+        assert {key: row[key] for key in expected} == expected
+
+
+@pytest.mark.parametrize("cls, param, values", CASES, ids=[case[0].__name__ for case in CASES])
+def test_zero_dimensional_parameters_match_summary(cls, param, values):
+    value = values[len(values) // 2].item()
+    summary = cls(**{param: as_batch_array(value)}).summary()
+
+    expected = cls(**{param: value}).summary()
+    assert {key: np.asarray(summary[key]).item() for key in expected} == expected
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.comparisons.cache import ResultCache, memoize_comparison
+from src.comparisons.household import Bathroom
+from src.comparisons.kernel import comparison_table
+
+
+@pytest.fixture
+def cached_compare(tmp_path):
+    """
+    `compare_water_heaters` memoized on a fresh cache with an on-disk store.
+    """
+    cache = ResultCache(maxsize=8, cache_dir=tmp_path)
+
+    @memoize_comparison(cache=cache)
+    def compare_water_heaters(liters=50, price_per_kwh=None, emission_factor=None):
+        devices = Bathroom.water_heater_devices(liters)
+        return comparison_table(devices, price_per_kwh=price_per_kwh, emission_factor=emission_factor)
+
+    return compare_water_heaters, cache
+
+
+def test_results_are_writeable_and_do_not_change_the_cache(cached_compare):
+    compare, cache = cached_compare
+    expected = compare()
+
+    df = compare()
+    df.loc[0, "cost_pln"] = -1.0
+    df.iloc[1, df.columns.get_loc("time_min")] = -1.0
+    df["co2_emission_kg"] *= 2
+
+    pd.testing.assert_frame_equal(compare(), expected)
+    assert (cache.misses, cache.hits) == (1, 2)
+
+
+def test_results_loaded_from_disk_are_writeable(cached_compare):
+    compare, cache = cached_compare
+    expected = compare()
+    cache.clear()
+
+    df = compare()
+    df.loc[0, "cost_pln"] = -1.0
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(compare(), expected)
+
+
+def test_array_arguments_are_keyed_by_content(cached_compare):
+    compare, cache = cached_compare
+    low = compare(price_per_kwh=np.array([0.3, 0.6]))
+    high = compare(price_per_kwh=np.array([0.9, 1.2]))
+    assert cache.misses == 2
+    assert not low["cost_pln"].equals(high["cost_pln"])
+
+    pd.testing.assert_frame_equal(compare(price_per_kwh=np.array([0.3, 0.6])), low)
+    assert cache.hits == 1
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.comparisons.household import Kitchen, Bathroom, Room
+
+# (compare_* method, device factory) with the default scenario parameters
+COMPARISONS = [
+    (Kitchen.compare_water_boiling_devices, Kitchen.water_boiling_devices),
+    (Kitchen.compare_cooking_devices, Kitchen.cooking_devices),
+    (Kitchen.compare_heating_devices, Kitchen.food_heating_devices),
+    (Kitchen.compare_coffee_devices, Kitchen.coffee_devices),
+    (Kitchen.compare_multicookers, Kitchen.multicooker_devices),
+    (Bathroom.compare_water_heaters, Bathroom.water_heater_devices),
+    (Bathroom.compare_bathing_options, Bathroom.bathing_devices),
+    (Bathroom.compare_bathroom_heating, Bathroom.bathroom_heating_devices),
+    (Room.compare_workstations, Room.workstation_devices),
+    (Room.compare_cooling_devices, Room.cooling_devices),
+]
+OVERRIDES = [
+    (0.95, None),
+    (None, 0.7),
+    (0.95, 0.7),
+    (np.array([0.3, 0.62, 1.4]), None),
+    (None, np.array([0.1, 0.4, 0.75])),
+    (np.array([0.3, 0.62, 1.4]), 0.7),
+    (np.array([0.3, 0.62, 1.4]), np.array([0.1, 0.4, 0.75])),
+]
+
+
+def expected_summary(dev, price_per_kwh, emission_factor):
+    """
+    Scalar `summary()` of one device, re-priced for electric devices with the scalar methods.
+    """
+    summary = dev.summary()
+    if dev.energy_carrier == "electricity":
+        if price_per_kwh is not None:
+            summary["cost_pln"] = round(dev.energy_consumption() * price_per_kwh, 2)
+            if "cost_per_kwh_heat" in summary:
+                summary["cost_per_kwh_heat"] = dev.cost_per_kwh_heat(price_per_kwh)
+        if emission_factor is not None:
+            summary["co2_emission_kg"] = round(dev.energy_consumption() * emission_factor, 3)
+            if "co2_per_kwh_heat" in summary:
+                summary["co2_per_kwh_heat"] = dev.heating_quality(emission_factor)
+    return summary
+
+
+@pytest.mark.parametrize("price_per_kwh, emission_factor", OVERRIDES)
+@pytest.mark.parametrize("compare, factory", COMPARISONS, ids=[c.__name__ for c, _ in COMPARISONS])
+def test_overrides_match_scalar_summary(compare, factory, price_per_kwh, emission_factor):
+    df = compare(price_per_kwh=price_per_kwh, emission_factor=emission_factor)
+
+    devices = factory()
+    size = max(np.size(price_per_kwh), np.size(emission_factor))
+    prices = np.broadcast_to(np.asarray(price_per_kwh, dtype=object), (size,))
+    factors = np.broadcast_to(np.asarray(emission_factor, dtype=object), (size,))
+    assert len(df) == size * len(devices)
+
+    rows = iter(df.to_dict("records"))
+    for price, factor in zip(prices.tolist(), factors.tolist()):
+        for dev in devices:
+            row = next(rows)
+            expected = expected_summary(dev, price, factor)
+            assert {key: row[key] for key in expected} == expected
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from src.pipelines.consolidate_sensor_dataset import DATASET_NAME, consolidate, scan_sensor_dataset
+
+KETTLE = "home105_kitchen1110_sensor5283_electric-appliance_kettle.parquet"
+WASHER = "home105_kitchen1110_sensor5284_electric-appliance_washingmachine.parquet"
+
+
+def write_sensor(path, start, count, step_s=600):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pl.DataFrame({
+        "timestamp": [start + timedelta(seconds=i * step_s) for i in range(count)],
+        "value": list(range(count)),
+    }).with_columns(pl.col("value").cast(pl.Int32)).write_parquet(path)
+
+
+def month_mtimes(dataset):
+    return {
+        path.parent.name: path.stat().st_mtime_ns
+        for path in dataset.glob("home_id=*/sensor_category=*/year_month=*/*.parquet")
+    }
+
+
+@pytest.fixture
+def source(tmp_path):
+    # 2017-01-20 .. 2017-02-12 in ten-minute readings
+    write_sensor(tmp_path / "src" / KETTLE, datetime(2017, 1, 20), 3456)
+    write_sensor(tmp_path / "src" / WASHER, datetime(2017, 1, 25), 1000)
+    return tmp_path / "src"
+
+
+def test_append_rewrites_only_the_touched_month(source, tmp_path):
+    dataset = consolidate(source, tmp_path / "out", workers=1)
+    before = month_mtimes(dataset)
+    assert set(before) == {"year_month=2017-01", "year_month=2017-02"}
+
+    write_sensor(source / KETTLE, datetime(2017, 1, 20), 3457)
+    consolidate(source, tmp_path / "out", workers=1)
+    after = month_mtimes(dataset)
+
+    assert after["year_month=2017-01"] == before["year_month=2017-01"]
+    assert after["year_month=2017-02"] != before["year_month=2017-02"]
+
+    rebuilt = consolidate(source, tmp_path / "rebuilt", workers=1)
+    key = ["sensor_name", "timestamp"]
+    updated = scan_sensor_dataset(dataset).sort(key).collect()
+    assert updated.height == 3457 + 1000
+    assert updated.equals(scan_sensor_dataset(rebuilt).sort(key).collect())
+
+
+def test_unchanged_files_are_not_rewritten(source, tmp_path):
+    dataset = consolidate(source, tmp_path / "out", workers=1)
+    before = month_mtimes(dataset)
+    (source / KETTLE).touch()
+
+    consolidate(source, tmp_path / "out", workers=1)
+    assert month_mtimes(dataset) == before
+
+
+def test_months_without_readings_are_removed(source, tmp_path):
+    dataset = consolidate(source, tmp_path / "out", workers=1)
+    write_sensor(source / KETTLE, datetime(2017, 1, 20), 100)
+    (source / WASHER).unlink()
+
+    consolidate(source, tmp_path / "out", workers=1)
+    assert set(month_mtimes(dataset)) == {"year_month=2017-01"}
+    assert scan_sensor_dataset(dataset).collect().height == 100
+    assert (tmp_path / "out" / DATASET_NAME).exists()
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.comparisons.decision_regions import DecisionRegionIndex, build_decision_indices
+from src.comparisons.household import Kitchen, Bathroom
+from src.comparisons.optimizer import find_optimal_device
+from src.recommendation_engine.recommend_best_device_per_group import recommend_best_per_category_for_input
+
+BASE_FEATURES = ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"]
+DATASETS = {
+    "heating": (Kitchen.compare_heating_devices(time_minutes=30), BASE_FEATURES + ["heating_quality"]),
+    "cooking": (Kitchen.compare_cooking_devices(time_minutes=30), BASE_FEATURES),
+    "heaters": (Bathroom.compare_water_heaters(liters=50), BASE_FEATURES),
+}
+
+
+@pytest.fixture(scope="module")
+def indices():
+    return build_decision_indices(DATASETS)
+
+
+@pytest.mark.parametrize("category", DATASETS)
+def test_lookup_matches_find_optimal_device(indices, category):
+    df, features = DATASETS[category]
+    index = indices[category]
+    rng = np.random.default_rng(0)
+
+    for raw in rng.uniform(-1, 1, size=(200, len(features))):
+        weights = dict(zip(features, (raw / np.abs(raw).sum()).tolist()))
+        ranked = find_optimal_device(df, weights)
+
+        device, score, margin = index.lookup(weights)
+        assert device == ranked["name"].iloc[0]
+        assert score == ranked["score"].iloc[0]
+        assert margin == pytest.approx(ranked["score"].iloc[0] - ranked["score"].iloc[1], abs=1e-12)
+        assert index.contains(device, weights)
+
+
+def test_lookup_batch_matches_single_lookups(indices):
+    index = indices["heaters"]
+    weight_matrix = np.random.default_rng(1).uniform(-1, 1, size=(100, len(index.features)))
+
+    names, scores, margins = index.lookup_batch(weight_matrix)
+
+    assert [index.lookup(row) for row in weight_matrix] == list(zip(names, scores, margins))
+    assert np.all(margins >= 0)
+
+
+def test_raw_slider_positions_are_rescaled(indices):
+    index = indices["cooking"]
+
+    assert index.lookup({"cost_pln": -8, "device_cost": 2}) == index.lookup({"cost_pln": -0.8, "device_cost": 0.2})
+
+
+def test_invalid_weights_raise(indices):
+    index = indices["cooking"]
+
+    with pytest.raises(KeyError, match="heating_quality"):
+        index.lookup({"cost_pln": -1.0, "heating_quality": 0.5})
+    with pytest.raises(ValueError, match="non-zero"):
+        index.lookup({"cost_pln": 0.0})
+    with pytest.raises(ValueError, match="Expected 5 weights"):
+        index.lookup([1.0, 0.0])
+
+
+def test_single_device_has_infinite_margin():
+    index = DecisionRegionIndex(["Only"], ["cost_pln"], [[0.0]])
+
+    assert index.lookup({"cost_pln": -1.0}) == ("Only", 0.0, np.inf)
+
+
+def test_recommendation_for_user_input_follows_slider_signs(indices):
+    # Suwak kosztu energii (0..10) oznacza wagę ujemną w siatce: wygrywa urządzenie o najniższym koszcie
+    saver = recommend_best_per_category_for_input({"cost_pln": 10, "heating_quality": 0}, indices)
+    for category, (df, _) in DATASETS.items():
+        assert saver[category][0] == df.loc[df["cost_pln"].idxmin(), "name"]
+
+    # Dodatni device_cost (profil Bourgeois) wybiera najdroższe urządzenie
+    bourgeois = recommend_best_per_category_for_input({"device_cost": 10}, indices)
+    for category, (df, _) in DATASETS.items():
+        assert bourgeois[category][0] == df.loc[df["device_cost"].idxmax(), "name"]
+
+    assert recommend_best_per_category_for_input({"cost_pln": 0, "device_cost": 0}, indices) == {}
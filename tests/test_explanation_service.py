@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.ai_answer_engine.explanation_service import ExplanationService, GeminiRestClient, fallback_explanation
+from src.ai_answer_engine.prompts import build_prompt, get_profile_description
+
+USER_INPUT = {
+    "cost_pln": 8,
+    "co2_emission_kg": 3,
+    "normalized_comfort": 5,
+    "normalized_failure_rate": 2,
+    "device_cost": -4,
+    "cooking_quality": None,
+}
+PROFILES = ("Saver", "EcoFriendly")
+
+
+class FakeClient:
+    """
+    Stands in for GeminiRestClient: counts calls and answers after `delay` seconds.
+    """
+
+    model_name = "fake-model"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate(self, prompt, timeout):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"Wyjaśnienie nr {self.calls}"
+
+
+def test_concurrent_identical_requests_share_one_call():
+    client = FakeClient()
+    service = ExplanationService(client)
+
+    async def run():
+        return await asyncio.gather(*(service.explain_async(USER_INPUT, PROFILES) for _ in range(8)))
+
+    answers = asyncio.run(run())
+
+    assert client.calls == 1
+    assert answers == ["Wyjaśnienie nr 1"] * 8
+    # The answer is cached, so a later request does not call the client either
+    assert asyncio.run(service.explain_async(USER_INPUT, PROFILES)) == "Wyjaśnienie nr 1"
+    assert client.calls == 1
+
+
+def test_timeout_returns_fallback_and_is_not_cached():
+    client = FakeClient(delay=1.0)
+    service = ExplanationService(client, timeout=0.05)
+
+    assert asyncio.run(service.explain_async(USER_INPUT, PROFILES)) == fallback_explanation(PROFILES)
+    assert asyncio.run(service.explain_async(USER_INPUT, PROFILES)) == fallback_explanation(PROFILES)
+    assert client.calls == 2
+
+
+def test_blocking_explain_coalesces_across_threads():
+    client = FakeClient(delay=0.2)
+    service = ExplanationService(client)
+
+    async def run():
+        return await asyncio.gather(*(asyncio.to_thread(service.explain, USER_INPUT, PROFILES) for _ in range(4)))
+
+    assert asyncio.run(run()) == ["Wyjaśnienie nr 1"] * 4
+    assert client.calls == 1
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    """
+    Answers `generateContent` like the Gemini API; `server.mode` selects "ok", "slow" or "error".
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append({"path": self.path, "headers": {key.lower(): value for key, value in self.headers.items()}, "body": body})
+        if self.server.mode == "slow":
+            time.sleep(1.0)
+        if self.server.mode == "error":
+            self.send_response(500)
+            self.end_headers()
+            return
+        payload = json.dumps({"candidates": [{"content": {"parts": [{"text": "  Odpowiedź serwera  "}]}}]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(payload.encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeminiHandler)
+    server.daemon_threads = True
+    server.mode = "ok"
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def stub_client(server):
+    return GeminiRestClient("test-key", model_name="stub-model", api_endpoint=f"http://127.0.0.1:{server.server_port}/")
+
+
+def test_rest_client_sends_generate_content_request(stub_server):
+    service = ExplanationService(stub_client(stub_server), timeout=5.0)
+
+    assert service.explain(USER_INPUT, PROFILES) == "Odpowiedź serwera"
+
+    [request] = stub_server.requests
+    assert request["path"] == "/v1beta/models/stub-model:generateContent"
+    assert request["headers"]["x-goog-api-key"] == "test-key"
+    assert request["headers"]["content-type"] == "application/json"
+    prompt = build_prompt(
+        USER_INPUT, PROFILES, get_profile_description(PROFILES[0]), get_profile_description(PROFILES[1])
+    )
+    assert request["body"] == {"contents": [{"parts": [{"text": prompt}]}]}
+
+
+@pytest.mark.parametrize("mode", ["slow", "error"])
+def test_rest_client_timeout_or_http_error_returns_fallback(stub_server, mode):
+    stub_server.mode = mode
+    service = ExplanationService(stub_client(stub_server), timeout=0.2)
+
+    assert service.explain(USER_INPUT, PROFILES) == fallback_explanation(PROFILES)
+    assert len(stub_server.requests) == 1
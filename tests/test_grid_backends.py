@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.comparisons.household import Kitchen, Bathroom
+from src.comparisons.grid import _compute_grid_shared, compute_all_combinations_parallel, iter_weight_blocks
+from src.comparisons.optimizer import find_optimal_device
+
+STEP = 0.25
+CASES = [
+    (Kitchen.compare_heating_devices(time_minutes=30),
+     ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost", "heating_quality"]),
+    (Kitchen.compare_cooking_devices(time_minutes=30),
+     ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"]),
+    (Bathroom.compare_water_heaters(liters=50),
+     ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"]),
+]
+
+
+def baseline_find_optimal_device(df, weights):
+    """
+    Frozen copy of the original pandas `find_optimal_device`, independent of the NumPy
+    helpers shared by the grid backends: per-column min-max normalization, weighted sum, sort.
+    The sort is stable, so exact ties go to the device listed first.
+    """
+    df = df.copy()
+    df["score"] = 0.0
+    for col, weight in weights.items():
+        col_min = df[col].min()
+        col_max = df[col].max()
+        if col_max > col_min:
+            normalized = (df[col] - col_min) / (col_max - col_min)
+        else:
+            normalized = 0
+        df["score"] += normalized * weight
+    return df.sort_values(by="score", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def reference_grid(df, features, weights):
+    """
+    Optimal device and score of every weight row from `baseline_find_optimal_device`.
+    """
+    devices, scores = [], []
+    for row in weights.itertuples(index=False):
+        scored = baseline_find_optimal_device(df, dict(zip(features, row)))
+        devices.append(scored.iloc[0]["name"])
+        scores.append(scored.iloc[0]["score"])
+    return np.array(devices, dtype=object), np.array(scores)
+
+
+@pytest.mark.parametrize("df, features", CASES)
+@pytest.mark.parametrize("backend", ["numpy", "numba", "joblib"])
+def test_backend_matches_baseline_find_optimal_device(df, features, backend):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    if backend == "joblib":
+        pytest.importorskip("joblib")
+
+    grid = compute_all_combinations_parallel(df, features, step=STEP, n_jobs=2, backend=backend)
+    devices, scores = reference_grid(df, features, grid[features])
+
+    assert len(grid) > 0
+    np.testing.assert_array_equal(grid["optimal_device"].to_numpy(dtype=object), devices)
+    np.testing.assert_array_equal(grid["optimal_score"].to_numpy(), scores)
+
+
+def test_ties_resolved_in_favour_of_first_device():
+    df = pd.DataFrame({
+        "name": ["A", "B"],
+        "cost_pln": [1.0, 1.0],
+        "quality": [0.0, 1.0],
+        "comfort_penalty": [0.0, 0.0],
+        "failure_rate": [0.0, 0.0],
+    })
+    # cost_pln is constant (normalized to 0) and quality has weight 0: both devices score 0
+    grid = compute_all_combinations_parallel(df, ["cost_pln", "quality"], step=0.5)
+    tied = grid[grid["quality"] == 0]
+    assert (tied["optimal_device"] == "A").all()
+    assert find_optimal_device(df, {"cost_pln": 1.0, "quality": 0.0}).iloc[0]["name"] == "A"
+
+
+@pytest.mark.parametrize("n_features, step, block_size", [(6, 0.25, 7), (5, 0.1, 1000), (3, 0.5, 4)])
+def test_weight_blocks_start_at_any_block(n_features, step, block_size):
+    blocks = list(iter_weight_blocks(n_features, step, block_size))
+
+    for start in range(len(blocks) + 1):
+        tail = list(iter_weight_blocks(n_features, step, block_size, start_block=start))
+        assert len(tail) == len(blocks) - start
+        assert all(np.array_equal(a, b) for a, b in zip(tail, blocks[start:]))
+
+
+def test_shared_backend_with_many_blocks_matches_numpy():
+    pytest.importorskip("joblib")
+    df, features = CASES[0]
+
+    # Workers generate their own weight blocks, so a small block size exercises the block offsets
+    grid = _compute_grid_shared(df, features, STEP, n_jobs=2, block_size=97)
+
+    pd.testing.assert_frame_equal(grid, compute_all_combinations_parallel(df, features, step=STEP))
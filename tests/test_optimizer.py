@@ -0,0 +1,31 @@
+import tracemalloc
+
+import numpy as np
+
+from src.comparisons.household import Bathroom
+from src.comparisons.optimizer import find_optimal_device_batch, normalize_device_matrix, score_weight_matrix
+
+FEATURES = ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate", "device_cost"]
+
+
+def test_preallocated_buffers_do_not_allocate():
+    normalized = normalize_device_matrix(Bathroom.compare_water_heaters(liters=50), FEATURES)
+    weight_matrix = np.random.default_rng(0).uniform(-1, 1, size=(50_000, len(FEATURES)))
+    expected = score_weight_matrix(normalized, weight_matrix)
+    out = np.empty_like(expected)
+    scratch = np.empty_like(expected)
+
+    tracemalloc.start()
+    for _ in range(3):
+        scores = score_weight_matrix(normalized, weight_matrix, out=out, scratch=scratch)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert scores is out
+    assert np.array_equal(scores, expected)
+    # A single (n_weights, n_devices) block is 1.6 MB; the loop must stay far below that
+    assert peak < expected.nbytes // 10
+
+    best, best_scores = find_optimal_device_batch(normalized, weight_matrix, out=out, scratch=scratch)
+    assert np.array_equal(best, expected.argmax(axis=1))
+    assert np.array_equal(best_scores, expected.max(axis=1))
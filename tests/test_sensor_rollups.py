@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from src.data_processing.aggregate_data_daily import aggregate_data_daily_lazy
+from src.data_processing.integrate_power import with_interval_energy
+from src.data_processing.query_sensor_rollup import choose_rollup_resolution, query_sensor_rollup
+from src.pipelines.build_sensor_rollups import build_rollups
+from src.pipelines.consolidate_sensor_dataset import consolidate
+
+SENSORS = {
+    "5283": "home105_kitchen1110_sensor5283_electric-appliance_kettle.parquet",
+    "5284": "home105_kitchen1110_sensor5284_electric-appliance_washingmachine.parquet",
+}
+
+
+@pytest.mark.parametrize("every, start, end, resolution", [
+    ("1mo", None, None, "month"),
+    ("1q", datetime(2017, 1, 1), datetime(2017, 4, 1), "month"),
+    ("1mo", datetime(2017, 1, 15), None, "day"),
+    ("1d", None, None, "day"),
+    ("1w", None, None, "day"),
+    ("1d", datetime(2017, 1, 1, 6), None, "hour"),
+    ("6h", None, None, "hour"),
+    ("15m", None, None, "minute"),
+    ("1h", datetime(2017, 1, 1, 6, 30), None, "minute"),
+])
+def test_choose_rollup_resolution(every, start, end, resolution):
+    assert choose_rollup_resolution(every, start, end) == resolution
+
+
+@pytest.mark.parametrize("every, start", [
+    ("1h", datetime(2017, 1, 1, 6, 30, 15)),
+    ("30s", None),
+    ("daily", None),
+])
+def test_choose_rollup_resolution_rejects_unanswerable_queries(every, start):
+    with pytest.raises(ValueError):
+        choose_rollup_resolution(every, start)
+
+
+def write_sensor(path, timestamps, values):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pl.DataFrame({"timestamp": timestamps, "value": values}).with_columns(
+        pl.col("timestamp").cast(pl.Datetime("us")), pl.col("value").cast(pl.Int32)
+    ).write_parquet(path)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """
+    Two sensors with irregular 1-9 s sampling and a few gaps around the January/February boundary.
+    """
+    rng = np.random.default_rng(7)
+    for i, name in enumerate(SENSORS.values()):
+        steps = rng.integers(1, 10, size=20_000).astype(float)
+        steps[rng.choice(len(steps), size=5, replace=False)] = 300
+        start = datetime(2017, 1, 31, 12) + timedelta(seconds=i)
+        timestamps = [start + timedelta(seconds=s) for s in np.cumsum(steps).tolist()]
+        write_sensor(tmp_path / "raw" / name, timestamps, rng.integers(0, 3000, size=len(steps)))
+    sensors = consolidate(tmp_path / "raw", tmp_path / "out", workers=1)
+    rollups = build_rollups(sensors, tmp_path / "out" / "rollups", workers=1)
+    return tmp_path / "raw", sensors, rollups
+
+
+def raw_readings(raw):
+    return pl.concat([
+        with_interval_energy(pl.scan_parquet(raw / name), by=None).with_columns(pl.lit(sensor_id).alias("sensor_id"))
+        for sensor_id, name in SENSORS.items()
+    ])
+
+
+def test_rollup_daily_totals_match_raw_series(dataset):
+    raw, _, rollups = dataset
+    rolled = (
+        query_sensor_rollup(rollups, "1d")
+        .select(pl.col("sensor_name").cast(pl.String), pl.col("period_start").dt.date().alias("date"), "energy_kWh")
+        .sort("sensor_name", "date")
+        .collect()
+    )
+    expected = (
+        aggregate_data_daily_lazy([str(raw / name) for name in SENSORS.values()])
+        .with_columns(pl.col("source_file").str.extract(r"electric-appliance_(\w+)\.parquet$").alias("sensor_name"))
+        .sort("sensor_name", "date")
+    )
+
+    assert rolled["date"].to_list() == expected["date"].to_list()
+    # includes 2017-01-31, whose last readings are integrated up to the first February readings
+    np.testing.assert_allclose(rolled["energy_kWh"], expected["daily_kWh"], rtol=1e-12)
+
+
+def test_hourly_query_matches_raw_readings(dataset):
+    raw, _, rollups = dataset
+    start, end = datetime(2017, 1, 31, 18), datetime(2017, 2, 1, 6)
+    rolled = (
+        query_sensor_rollup(rollups, "1h", start=start, end=end, sensor_name="kettle")
+        .sort("period_start")
+        .collect()
+    )
+    expected = (
+        raw_readings(raw)
+        .filter((pl.col("sensor_id") == "5283") & pl.col("timestamp").is_between(start, end, closed="left"))
+        .group_by_dynamic("timestamp", every="1h")
+        .agg(
+            pl.col("energy_kWh").sum(),
+            pl.col("value").mean().alias("mean_W"),
+            pl.col("value").max().alias("max_W"),
+            pl.len().alias("samples"),
+            pl.col("is_gap").sum().alias("gaps"),
+        )
+        .collect()
+    )
+
+    assert rolled["period_start"].to_list() == expected["timestamp"].to_list()
+    # mean_W of the hour is the sample-weighted mean of the minute means
+    np.testing.assert_allclose(rolled["mean_W"], expected["mean_W"], rtol=1e-12)
+    np.testing.assert_allclose(rolled["energy_kWh"], expected["energy_kWh"], rtol=1e-12)
+    assert rolled["max_W"].to_list() == expected["max_W"].to_list()
+    assert rolled["samples"].to_list() == expected["samples"].to_list()
+    assert rolled["gaps"].to_list() == expected["gaps"].to_list()
+
+
+def rollup_mtimes(rollups):
+    return {
+        str(path.relative_to(rollups)): path.stat().st_mtime_ns
+        for path in rollups.glob("resolution=*/**/part-0.parquet")
+    }
+
+
+def test_append_recomputes_only_the_changed_month(dataset):
+    raw, sensors, rollups = dataset
+    before = rollup_mtimes(rollups)
+    kettle = pl.read_parquet(raw / SENSORS["5283"])
+    appended = kettle.tail(1).with_columns(pl.col("timestamp") + timedelta(seconds=2))
+    write_sensor(raw / SENSORS["5283"], pl.concat([kettle, appended])["timestamp"], pl.concat([kettle, appended])["value"])
+
+    consolidate(raw, sensors.parent, workers=1)
+    build_rollups(sensors, rollups, workers=1)
+    after = rollup_mtimes(rollups)
+
+    changed = {path.split("/")[-2] for path in after if after[path] != before[path]}
+    assert changed == {"year_month=2017-02"}
@@ -0,0 +1,46 @@
+import gzip
+import os
+
+import polars as pl
+
+from src.pipelines.transform_to_parquet_parallel import convert_csv_to_parquet, ingest, load_manifest
+
+READINGS = "2017-01-20 00:00:00,120\n2017-01-20 00:00:01,121\n"
+
+
+def write_gz(path, text):
+    with gzip.open(path, "wt") as f:
+        f.write(text)
+
+
+def test_ingest_skips_files_without_readings(tmp_path):
+    source, target = tmp_path / "CSV", tmp_path / "Parquet"
+    source.mkdir()
+    (source / "empty.csv").write_text("")
+    write_gz(source / "empty.csv.gz", "")
+    write_gz(source / "sensor.csv.gz", READINGS)
+    assert (source / "empty.csv.gz").stat().st_size > 0
+
+    ingest(source, target, workers=1)
+
+    assert sorted(path.name for path in target.glob("*.parquet")) == ["sensor.parquet"]
+    assert pl.read_parquet(target / "sensor.parquet")["value"].to_list() == [120, 121]
+    manifest = load_manifest(target)
+    assert manifest[str(source / "empty.csv")]["target"] is None
+    assert manifest[str(source / "empty.csv.gz")]["target"] is None
+    assert manifest[str(source / "sensor.csv.gz")]["target"] == str(target / "sensor.parquet")
+
+
+def test_emptied_source_removes_its_parquet_file(tmp_path):
+    source_file, target_file = tmp_path / "sensor.csv.gz", tmp_path / "sensor.parquet"
+    write_gz(source_file, READINGS)
+    status, entry = convert_csv_to_parquet(source_file, target_file, None)
+    assert status == "converted" and target_file.exists()
+
+    write_gz(source_file, "")
+    status, new_entry = convert_csv_to_parquet(source_file, target_file, entry)
+
+    assert status == "empty"
+    assert new_entry["target"] is None
+    assert not target_file.exists()
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
@@ -0,0 +1,54 @@
+import numpy as np
+import polars as pl
+import pyarrow.parquet as pq
+
+from src.pipelines.user_profile_to_grid import (
+    PARTITION_COLS,
+    SORT_COLS,
+    build_profile_query,
+    scan_grids,
+    write_profile_dataset,
+)
+
+DEVICES = ["Microwave", "Kettle", "GasHob", "InductionHob"]
+
+
+def write_grid(path, quality_col, n_rows, seed):
+    rng = np.random.default_rng(seed)
+    weights = {
+        col: -np.round(rng.integers(0, 11, n_rows) / 10, 1).astype(np.float32)
+        for col in ["cost_pln", "co2_emission_kg", "normalized_comfort", "normalized_failure_rate"]
+    }
+    weights["device_cost"] = np.round(rng.integers(-10, 11, n_rows) / 10, 1).astype(np.float32)
+    weights[quality_col] = np.round(rng.integers(0, 11, n_rows) / 10, 1).astype(np.float32)
+    pl.DataFrame({
+        **weights,
+        "optimal_device": pl.Series(rng.choice(DEVICES, n_rows), dtype=pl.Categorical),
+        "optimal_score": rng.random(n_rows),
+    }).write_parquet(path)
+
+
+def test_partitions_are_sorted_and_hold_every_row(tmp_path):
+    grids = tmp_path / "GRID"
+    grids.mkdir()
+    write_grid(grids / "cooking_grid.parquet", "cooking_quality", 5000, seed=1)
+    write_grid(grids / "heating_grid.parquet", "heating_quality", 3000, seed=2)
+    target = grids / "grid_with_profiles"
+
+    write_profile_dataset(grids, target)
+
+    files = sorted(target.glob("profile=*/category=*/*.parquet"))
+    assert {path.parent.name for path in files} == {"category=cooking", "category=heating"}
+    for path in files:
+        part = pl.read_parquet(path)
+        assert part.equals(part.sort(SORT_COLS, nulls_last=True, maintain_order=True))
+        # Każda grupa wierszy ma statystyki min/max, więc filtr po urządzeniu pomija grupy
+        statistics = pq.ParquetFile(path).metadata.row_group(0).column(0).statistics
+        assert statistics is not None and statistics.has_min_max
+
+    written = pl.read_parquet(target, hive_partitioning=True)
+    expected = build_profile_query(scan_grids(grids)).collect()
+    columns = expected.columns
+    assert written.select(columns).with_columns(pl.col(PARTITION_COLS).cast(pl.String)).sort(columns).equals(
+        expected.sort(columns)
+    )